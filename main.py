@@ -8,16 +8,31 @@ annotations of grooming events and generates timeline tables, event lists, visua
 and summary statistics.
 """
 
+from __future__ import annotations
+
 import argparse
+import codecs
+import contextlib
+import hashlib
+import importlib.util
+import io
+import mmap
 import os
 import sys
 import logging
-import pandas as pd
-import numpy as np
+from collections import OrderedDict
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Tuple, Optional, Union, Dict, Any, List
+from typing import TYPE_CHECKING, IO, Tuple, Optional, Union, Dict, Any, Iterator
 from datetime import datetime
 
+# pandas, numpy and the process pool are imported inside the functions that use
+# them, so that `--help` and argument errors do not pay their import cost
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from matplotlib.axes import Axes
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                     format='%(asctime)s - %(levelname)s - %(message)s')
@@ -27,7 +42,253 @@ class DataValidationError(Exception):
     """Custom exception for data validation errors."""
     pass
 
-def process_csv(file_path: Union[str, Path], error_log: Optional[Dict[str, Any]] = None) -> Optional[pd.DataFrame]:
+# Validated frame arrays keyed by a digest of the file contents, so duplicate or
+# symlinked CSVs are parsed and validated only once per process. The cache keeps the
+# most recently used entries only. Pool workers each have their own cache, so
+# duplicates that land on different workers are still parsed once per worker.
+_VALIDATION_CACHE: OrderedDict[bytes, np.ndarray] = OrderedDict()
+_VALIDATION_CACHE_SIZE = 256
+
+# Figure sizes in inches for the per-file plots
+_TIMELINE_FIGSIZE = (12, 3)
+_BOX_PLOT_FIGSIZE = (8, 6)
+
+# Per-process figures reused across files, keyed by figure size
+_SHARED_AXES: Dict[Tuple[float, float], Axes] = {}
+
+# Set once the "colors repeat" warning has been logged in this process
+_WARNED_REPEATED_COLORS = False
+
+# Columns that must be present in every input CSV; only these are parsed
+_REQUIRED_COLUMNS = frozenset({'Frame'})
+
+# Columns every event list passed to the plotting functions must provide
+_EVENT_LIST_COLUMNS = frozenset({'EventID', 'StartFrame', 'StopFrame'})
+
+# Formats supported for the per-file timeline and event tables
+_TABLE_FORMATS = ('csv', 'parquet', 'feather')
+
+# Files above this size are memory-mapped; smaller ones use one large buffered read
+_MMAP_THRESHOLD = 16 << 20
+_READ_BUFFER_SIZE = 1 << 20
+
+@contextlib.contextmanager
+def _open_csv_buffer(file_path: Union[str, os.PathLike, IO]) -> Iterator[Union[bytes, mmap.mmap]]:
+    """
+    Yield the raw contents of a CSV file for hashing and parsing.
+    
+    Large files are memory-mapped so the parser reads straight from the page cache
+    instead of through a user-space copy. Smaller files are read in a single call.
+    File-like objects are read from their current position and text is UTF-8 encoded.
+    
+    Args:
+        file_path: Path to the CSV file, or an open text or binary file object
+        
+    Yields:
+        The file contents as bytes, or a read-only mmap for large files
+    """
+    if hasattr(file_path, 'read'):
+        data = file_path.read()
+        yield data.encode('utf-8') if isinstance(data, str) else data
+        return
+    
+    with open(file_path, 'rb', buffering=_READ_BUFFER_SIZE) as fh:
+        if os.fstat(fh.fileno()).st_size > _MMAP_THRESHOLD:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+        else:
+            yield fh.read()
+
+def _set_error(error_log: Dict[str, Any], filename: str, error_type: str,
+               details: str, frame: Optional[int] = None) -> None:
+    """
+    Record a validation error in an error log dictionary.
+    
+    Args:
+        error_log: Dictionary to fill in place
+        filename: Name of the file that failed validation
+        error_type: Short error category (e.g. 'Missing Column')
+        details: Human-readable error message
+        frame: Problematic frame number, if applicable
+    """
+    error_log['filename'] = filename
+    error_log['error_type'] = error_type
+    error_log['details'] = details
+    error_log['frame'] = frame
+
+# Number of frames compared per step when scanning for ordering violations
+_SCAN_BLOCK = 1 << 16
+
+def _first_nonincreasing(arr: np.ndarray) -> int:
+    """
+    Find the first frame that is not strictly greater than its predecessor.
+    
+    Adjacent frames are compared block by block, so the temporary boolean mask stays
+    cache-sized and the scan stops at the first block that contains a violation.
+    
+    Args:
+        arr: One-dimensional array of frame numbers
+        
+    Returns:
+        Index of the first offending frame, or -1 if frames are strictly increasing
+    """
+    import numpy as np
+
+    for start in range(1, arr.size, _SCAN_BLOCK):
+        stop = min(start + _SCAN_BLOCK, arr.size)
+        bad = arr[start:stop] <= arr[start - 1:stop - 1]
+        if bad.any():
+            return start + int(np.argmax(bad))
+    return -1
+
+def _disk_cache_path(file_path: str, cache_dir: Union[str, os.PathLike]) -> str:
+    """
+    Build the on-disk cache location for a CSV file's validated frames.
+    
+    The key combines the resolved path with the file's modification time and size,
+    so editing or replacing a file invalidates its entry without reading it.
+    
+    Args:
+        file_path: Path to the CSV file
+        cache_dir: Directory holding cached frame arrays
+        
+    Returns:
+        Path of the ``.npy`` file for the current version of the CSV file
+    """
+    stat = os.stat(file_path)
+    key = (os.path.realpath(file_path), stat.st_mtime_ns, stat.st_size)
+    key_hash = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, f"{key_hash}.npy")
+
+def _load_cached_frames(cache_file: str) -> Optional[np.ndarray]:
+    """
+    Load a previously validated frame array from the disk cache.
+    
+    Args:
+        cache_file: Path returned by _disk_cache_path
+        
+    Returns:
+        Read-only int64 array, or None if there is no usable entry
+    """
+    import numpy as np
+    
+    try:
+        arr = np.load(cache_file, allow_pickle=False)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        # A truncated or foreign file is ignored and overwritten after validation
+        logger.warning("Ignoring unreadable cache entry %s: %s", cache_file, e)
+        return None
+    
+    if arr.dtype != np.int64 or arr.ndim != 1:
+        return None
+    arr.setflags(write=False)
+    return arr
+
+def _store_cached_frames(cache_file: str, arr: np.ndarray) -> None:
+    """
+    Save a validated frame array to the disk cache.
+    
+    The array is written to a temporary file and renamed into place, so concurrent
+    workers never observe a partially written entry. Failures only cost a cache miss
+    on the next run and are logged rather than raised.
+    
+    Args:
+        cache_file: Path returned by _disk_cache_path
+        arr: Validated frame array
+    """
+    import numpy as np
+    
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, 'wb') as fh:
+            np.save(fh, arr, allow_pickle=False)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning("Could not write cache entry %s: %s", cache_file, e)
+        with contextlib.suppress(OSError):
+            os.remove(tmp_file)
+
+def _is_utf8(data: Union[bytes, mmap.mmap]) -> bool:
+    """
+    Check that raw CSV contents decode as UTF-8, as the pandas C engine requires.
+    
+    The contents are decoded in chunks of the read buffer size, so a memory-mapped
+    file is never copied into one large string.
+    
+    Args:
+        data: Raw CSV contents
+        
+    Returns:
+        True if the whole buffer is valid UTF-8, False otherwise
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    view = memoryview(data)
+    try:
+        for start in range(0, len(view), _READ_BUFFER_SIZE):
+            decoder.decode(view[start:start + _READ_BUFFER_SIZE])
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        view.release()
+    return True
+
+def _read_frames_arrow(source: Union[bytes, str]) -> Optional[np.ndarray]:
+    """
+    Parse the 'Frame' column with pyarrow's multi-threaded CSV reader.
+    
+    This is a fast path for well-formed files only. The column is read as text and
+    accepted only if every cell is a plain decimal integer, because Arrow's own integer
+    conversion also takes forms such as '0x10' that the pandas C engine rejects.
+    Other columns are never decoded, so callers must check with _is_utf8 first.
+    Whenever pyarrow is not installed or the input is anything else, None is returned
+    and the caller parses the file with the pandas C engine, which produces the usual
+    validation errors.
+    
+    Args:
+        source: Raw CSV contents, or the path of a file above the memory-map threshold.
+            Memory-mapped contents are not passed in, because Arrow's reader threads
+            may still hold the exported buffer when the mapping is closed.
+        
+    Returns:
+        int64 array of frame numbers, or None if the file needs the default parser
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        return None
+    
+    convert_options = pa_csv.ConvertOptions(include_columns=['Frame'],
+                                            column_types={'Frame': pa.string()})
+    if isinstance(source, bytes):
+        source = pa.BufferReader(source)
+    try:
+        table = pa_csv.read_csv(source,
+                                read_options=pa_csv.ReadOptions(use_threads=True),
+                                convert_options=convert_options)
+    except pa.ArrowException:
+        return None
+    
+    column = table.column('Frame')
+    if column.null_count:
+        return None
+    
+    # Accept only what the C engine reads as an integer; leave the rest to it
+    if not pc.all(pc.match_substring_regex(column, r'^\s*[+-]?[0-9]+\s*$')).as_py():
+        return None
+    try:
+        column = pc.cast(pc.utf8_trim_whitespace(column), pa.int64())
+    except pa.ArrowException:
+        return None
+    return column.to_numpy()
+
+def process_csv(file_path: Union[str, os.PathLike, IO], error_log: Optional[Dict[str, Any]] = None,
+                cache_dir: Optional[Union[str, os.PathLike]] = None,
+                fast_io: bool = False) -> Optional[np.ndarray]:
     """
     Process and validate a CSV file containing behavioral annotation data.
     
@@ -38,104 +299,138 @@ def process_csv(file_path: Union[str, Path], error_log: Optional[Dict[str, Any]]
     4. Confirms frames are in strictly increasing order
     
     Args:
-        file_path: Path to the CSV file to process
+        file_path: Path to the CSV file to process, or an open text or binary file
+            object such as ``io.StringIO``. Buffers are never cached on disk.
         error_log: Optional dictionary to store error information for batch processing
+        cache_dir: Optional directory for persisting validated frames between runs.
+            Files whose path, modification time and size are unchanged are not re-read.
+        fast_io: Parse with pyarrow's multi-threaded CSV reader when pyarrow is installed,
+            falling back to the pandas C engine otherwise or for files it cannot handle
         
     Returns:
-        DataFrame containing valid frame data if all checks pass, None otherwise
+        Read-only int64 array of the validated frame numbers if all checks pass, None otherwise
         
     Raises:
         DataValidationError: If any validation check fails and error_log is not provided
     """
-    file_path = Path(file_path)
-    filename = file_path.name
+    import numpy as np
+    import pandas as pd
+
+    # Plain string path operations avoid constructing a Path object per file.
+    # In-memory buffers are named after their 'name' attribute when they have one.
+    is_buffer = hasattr(file_path, 'read')
+    if is_buffer:
+        filename = os.path.basename(str(getattr(file_path, 'name', '<buffer>')))
+    else:
+        file_path = os.fspath(file_path)
+        filename = os.path.basename(file_path)
     
     try:
-        # Read the CSV file
-        logger.info(f"Reading file: {filename}")
-        df = pd.read_csv(file_path)
+        # Reuse the result of a previous run if the file has not changed since
+        cache_file = None
+        if cache_dir is not None and not is_buffer:
+            cache_file = _disk_cache_path(file_path, cache_dir)
+            cached = _load_cached_frames(cache_file)
+            if cached is not None:
+                logger.info("File %s unchanged since last run, loaded %d frame entries from cache", filename, cached.size)
+                return cached
         
-        # Check if 'Frame' column exists
-        if 'Frame' not in df.columns:
-            error_msg = f"File {filename} is missing the 'Frame' column"
-            if error_log is not None:
-                error_log.update({
-                    'filename': filename,
-                    'error_type': 'Missing Column',
-                    'details': error_msg,
-                    'frame': None
-                })
-                logger.error(error_msg)
-                return None
-            else:
-                raise DataValidationError(error_msg)
+        with _open_csv_buffer(file_path) as data:
+            # Skip parsing entirely if identical content has already been validated
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            cached = _VALIDATION_CACHE.get(digest)
+            if cached is not None:
+                _VALIDATION_CACHE.move_to_end(digest)
+                logger.info("File %s matches previously validated content with %d frame entries", filename, len(cached))
+                if cache_file is not None:
+                    _store_cached_frames(cache_file, cached)
+                return cached
+            
+            logger.info("Reading file: %s", filename)
+            
+            # Optionally try pyarrow's multi-threaded reader first. It only handles clean
+            # files, so anything it rejects is parsed again below and classified as usual.
+            arr = None
+            # Arrow only decodes 'Frame', so undecodable bytes elsewhere in the file must
+            # be caught here to fail exactly as the C engine does
+            if fast_io and _is_utf8(data):
+                arr = _read_frames_arrow(file_path if isinstance(data, mmap.mmap) else data)
+            
+            if arr is None:
+                # Read only the required columns; the other ImageJ columns are never used.
+                # The parser converts it straight to int64, so the numeric check happens
+                # while tokenizing rather than in separate conversion passes.
+                source = data if isinstance(data, mmap.mmap) else io.BytesIO(data)
+                try:
+                    df = pd.read_csv(source, usecols=lambda column: column in _REQUIRED_COLUMNS,
+                                     dtype={'Frame': np.int64}, engine='c')
+                except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError):
+                    # UnicodeDecodeError is a ValueError, but it is not about 'Frame'
+                    raise
+                except (ValueError, OverflowError):
+                    # Only 'Frame' is converted, so it holds values that are not integers
+                    error_msg = f"File {filename} contains non-numeric values in the 'Frame' column"
+                    if error_log is not None:
+                        _set_error(error_log, filename, 'Non-numeric Values', error_msg)
+                        logger.error(error_msg)
+                        return None
+                    else:
+                        raise DataValidationError(error_msg)
         
-        # Extract the Frame column
-        frames = df['Frame']
+        if arr is None:
+            # Check that all required columns exist, reporting every missing one at once
+            missing = _REQUIRED_COLUMNS.difference(df.columns)
+            if missing:
+                names = ", ".join(f"'{column}'" for column in sorted(missing))
+                error_msg = f"File {filename} is missing the {names} column{'s' if len(missing) > 1 else ''}"
+                if error_log is not None:
+                    _set_error(error_log, filename, 'Missing Column', error_msg)
+                    logger.error(error_msg)
+                    return None
+                else:
+                    raise DataValidationError(error_msg)
+            
+            # All further checks work on the raw int64 array to avoid pandas indexing overhead
+            arr = df['Frame'].to_numpy(dtype=np.int64)
         
-        # Check if all values can be converted to integers
-        try:
-            frames = frames.astype(int)
-        except ValueError:
-            error_msg = f"File {filename} contains non-numeric values in the 'Frame' column"
+        # Check if number of entries is even
+        if arr.size % 2 != 0:
+            error_msg = f"File {filename} contains an odd number of frame entries ({arr.size})"
             if error_log is not None:
-                error_log.update({
-                    'filename': filename,
-                    'error_type': 'Non-numeric Values',
-                    'details': error_msg,
-                    'frame': None
-                })
+                _set_error(error_log, filename, 'Odd Entry Count', error_msg)
                 logger.error(error_msg)
                 return None
             else:
                 raise DataValidationError(error_msg)
         
-        # Check if number of entries is even
-        if len(frames) % 2 != 0:
-            error_msg = f"File {filename} contains an odd number of frame entries ({len(frames)})"
+        # Check if frames are in strictly increasing order
+        i = _first_nonincreasing(arr)
+        if i != -1:
+            error_msg = f"File {filename} contains non-increasing frame numbers at position {i}"
+            problematic_frame = int(arr[i])
             if error_log is not None:
-                error_log.update({
-                    'filename': filename,
-                    'error_type': 'Odd Entry Count',
-                    'details': error_msg,
-                    'frame': None
-                })
+                _set_error(error_log, filename, 'Non-increasing Frames', error_msg, problematic_frame)
                 logger.error(error_msg)
                 return None
             else:
-                raise DataValidationError(error_msg)
-        
-        # Check if frames are in strictly increasing order
-        for i in range(1, len(frames)):
-            if frames.iloc[i] <= frames.iloc[i-1]:
-                error_msg = f"File {filename} contains non-increasing frame numbers at position {i}"
-                problematic_frame = frames.iloc[i]
-                if error_log is not None:
-                    error_log.update({
-                        'filename': filename,
-                        'error_type': 'Non-increasing Frames',
-                        'details': error_msg,
-                        'frame': problematic_frame
-                    })
-                    logger.error(error_msg)
-                    return None
-                else:
-                    raise DataValidationError(f"{error_msg} (frame: {problematic_frame})")
-        
-        # If all checks pass, return the extracted frames as a DataFrame
-        logger.info(f"File {filename} validated successfully with {len(frames)} frame entries")
-        return pd.DataFrame({'Frame': frames})
+                raise DataValidationError(f"{error_msg} (frame: {problematic_frame})")
+
+        # If all checks pass, remember the result and return the extracted frames.
+        # The array is shared with the cache, so it is made read-only.
+        arr.setflags(write=False)
+        _VALIDATION_CACHE[digest] = arr
+        if len(_VALIDATION_CACHE) > _VALIDATION_CACHE_SIZE:
+            _VALIDATION_CACHE.popitem(last=False)
+        if cache_file is not None:
+            _store_cached_frames(cache_file, arr)
+        logger.info("File %s validated successfully with %d frame entries", filename, arr.size)
+        return arr
     
     except Exception as e:
         # Catch any other exceptions (file not found, permission issues, etc.)
         error_msg = f"Error processing file {filename}: {str(e)}"
         if error_log is not None:
-            error_log.update({
-                'filename': filename,
-                'error_type': 'Processing Error',
-                'details': error_msg,
-                'frame': None
-            })
+            _set_error(error_log, filename, 'Processing Error', error_msg)
             logger.error(error_msg)
             return None
         else:
@@ -169,6 +464,34 @@ def parse_arguments():
         default=8999, 
         help="Total number of frames to consider (default: 8999)"
     )
+    parser.add_argument(
+        "--workers", 
+        type=int, 
+        default=None, 
+        help="Number of worker processes used to process a directory of CSV files (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--output_format", 
+        choices=_TABLE_FORMATS, 
+        default="csv", 
+        help="File format for the timeline and event tables; parquet and feather require pyarrow (default: csv)"
+    )
+    parser.add_argument(
+        "--cache_dir", 
+        type=str, 
+        default=None, 
+        help="Directory for caching validated frames between runs; unchanged input files are not re-read (default: no caching)"
+    )
+    parser.add_argument(
+        "--skip_timeline", 
+        action="store_true", 
+        help="Do not write the per-frame timeline tables; event lists, plots and the summary are unaffected"
+    )
+    parser.add_argument(
+        "--fast_io", 
+        action="store_true", 
+        help="Parse input CSV files with pyarrow's multi-threaded reader when pyarrow is installed"
+    )
     
     return parser.parse_args()
 
@@ -200,68 +523,211 @@ def validate_args(args):
         print("Error: total_frames must be a positive integer.")
         return False
         
+    # Validate workers is positive if provided
+    if args.workers is not None and args.workers <= 0:
+        print("Error: workers must be a positive integer.")
+        return False
+        
+    # Columnar output formats are written through pyarrow, which is optional
+    if args.output_format != 'csv' and importlib.util.find_spec('pyarrow') is None:
+        print(f"Error: output_format '{args.output_format}' requires the pyarrow package.")
+        return False
+        
+    # The pyarrow parser is only an optimisation, so its absence is not an error
+    if args.fast_io and importlib.util.find_spec('pyarrow') is None:
+        print("Warning: --fast_io requires the pyarrow package; using the default CSV parser.")
+        
     return True
 
-def generate_timeline(frames: pd.Series, total_frames: int) -> pd.DataFrame:
+def _split_pairs(frames: Union[pd.Series, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split frame numbers into validated start and stop arrays.
+    
+    Args:
+        frames: Series or array of frame numbers, alternating start and stop values
+        
+    Returns:
+        Tuple of (starts, stops) views into the frame values
+        
+    Raises:
+        ValueError: If the input has an odd number of entries or any pair has start > stop
+    """
+    import numpy as np
+
+    # View the frames as an int64 array, which is free for the arrays process_csv
+    # returns; other inputs such as float Series are converted so they can index
+    frame_values = np.asarray(frames, dtype=np.int64)
+    
+    # Ensure we have an even number of frames (should be pre-validated)
+    if len(frame_values) % 2 != 0:
+        raise ValueError("Expected an even number of frame entries for pairing")
+    
+    # Pair up start and stop frames as the two columns of a (num_events, 2) view
+    pairs = frame_values.reshape(-1, 2)
+    starts = pairs[:, 0]
+    stops = pairs[:, 1]
+    
+    # Validate that start <= stop for every pair in one vectorized comparison
+    invalid = np.flatnonzero(starts > stops)
+    if invalid.size:
+        i = int(invalid[0])
+        raise ValueError(f"Invalid frame pair at index {i}: start ({starts[i]}) > stop ({stops[i]})")
+    
+    return starts, stops
+
+def _timeline_arrays_from_pairs(starts: np.ndarray, stops: np.ndarray, total_frames: int,
+                                scratch: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build the timeline columns from validated start and stop arrays.
+    
+    Args:
+        starts: Start frame of each event
+        stops: Stop frame of each event
+        total_frames: Total number of frames to consider (N)
+        scratch: Optional int64 working buffer of length N + 1 to reuse instead of
+            allocating one; its contents are overwritten
+        
+    Returns:
+        Tuple of (grooming_flag, event_ids) arrays as described in generate_timeline_arrays
+    """
+    import numpy as np
+
+    # Ensure frames are within the valid range, reporting all adjusted events at once
+    adjusted = np.flatnonzero((starts < 1) | (stops > total_frames)) + 1
+    if adjusted.size:
+        logger.warning("Events %s extend beyond frames 1 to %d. Adjusted to that range.",
+                       adjusted.tolist(), total_frames)
+    starts = np.maximum(starts, 1)
+    stops = np.minimum(stops, total_frames)
+    
+    # Events lying entirely outside 1..N are empty after clamping and leave no mark
+    ids = np.arange(1, len(starts) + 1)
+    visible = starts <= stops
+    starts, stops, ids = starts[visible], stops[visible], ids[visible]
+    
+    # Narrow dtype for the IDs: they never exceed the number of events
+    id_dtype = np.min_scalar_type(len(visible))
+    
+    if np.all(starts[1:] > stops[:-1]):
+        # Disjoint events in order (always the case for validated input): encode each
+        # event as +id at its first frame and -id just past its last one, so a single
+        # cumulative sum yields the EventID of every frame with no per-event Python loop.
+        # Frame f lives at index f - 1; index N absorbs events that end on frame N.
+        if scratch is None:
+            delta = np.zeros(total_frames + 1, dtype=np.int64)
+        else:
+            delta = scratch
+            delta.fill(0)
+        delta[starts - 1] += ids
+        delta[stops] -= ids
+        
+        # Accumulate in place; only the narrowed copy outlives this call
+        running = delta[:total_frames]
+        event_ids = np.cumsum(running, out=running).astype(id_dtype)
+    else:
+        # Overlapping or unordered events: later events overwrite earlier ones
+        event_ids = np.zeros(total_frames, dtype=id_dtype)
+        for event_id, start, stop in zip(ids, starts, stops):
+            event_ids[start - 1:stop] = event_id
+    
+    # Every frame that belongs to an event is a grooming frame
+    grooming_flag = (event_ids != 0).view(np.uint8)
+    
+    return grooming_flag, event_ids
+
+def _timeline_from_pairs(starts: np.ndarray, stops: np.ndarray, total_frames: int,
+                         scratch: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """
+    Build the timeline table from validated start and stop arrays.
+    
+    Args:
+        starts: Start frame of each event
+        stops: Stop frame of each event
+        total_frames: Total number of frames to consider (N)
+        scratch: Optional working buffer, see _timeline_arrays_from_pairs
+        
+    Returns:
+        Timeline DataFrame as described in generate_timeline
+    """
+    import pandas as pd
+
+    grooming_flag, event_ids = _timeline_arrays_from_pairs(starts, stops, total_frames, scratch)
+    return pd.DataFrame({
+        'GroomingFlag': grooming_flag,
+        'EventID': event_ids
+    }, index=pd.RangeIndex(1, total_frames + 1, name='Frame'))
+
+def _event_list_from_pairs(starts: np.ndarray, stops: np.ndarray) -> pd.DataFrame:
+    """
+    Build the event list table from validated start and stop arrays.
+    
+    Args:
+        starts: Start frame of each event
+        stops: Stop frame of each event
+        
+    Returns:
+        Event list DataFrame as described in generate_event_list
+    """
+    import numpy as np
+    import pandas as pd
+
+    # Build the DataFrame directly from the columns (EventIDs start from 1)
+    return pd.DataFrame({
+        'EventID': np.arange(1, len(starts) + 1),
+        'StartFrame': starts,
+        'StopFrame': stops
+    })
+
+def generate_timeline(frames: Union[pd.Series, np.ndarray], total_frames: int) -> pd.DataFrame:
     """
     Generate a timeline table from the extracted frame numbers.
     
     This function:
     1. Pairs frame numbers as alternating start and stop values
     2. Validates each pair (start <= stop)
-    3. Creates a DataFrame with rows for frames 1 to N
+    3. Creates a DataFrame with rows for frames 1 to N, indexed by frame number
     4. For each valid event pair, updates the corresponding rows in the DataFrame
     
     Args:
-        frames: Series of frame numbers (assumed to be validated and even in count)
+        frames: Series or array of frame numbers (assumed to be validated and even in count)
         total_frames: Total number of frames to consider (N)
         
     Returns:
-        DataFrame containing the timeline with columns: Frame, GroomingFlag, EventID
+        DataFrame containing the timeline with columns GroomingFlag and EventID, indexed
+        by a RangeIndex named 'Frame' (frames 1 to N) rather than a materialized column.
+        GroomingFlag is uint8 and EventID is the smallest unsigned integer type that
+        holds the number of events (uint8 for fewer than 256 events).
         
     Raises:
         ValueError: If any pair is invalid (start > stop)
     """
-    # Create a timeline DataFrame with frames 1 to N
-    timeline = pd.DataFrame({
-        'Frame': range(1, total_frames + 1),
-        'GroomingFlag': 0,
-        'EventID': 0
-    })
-    
-    # Convert frames to numpy array if it's a pandas Series
-    frame_values = frames.values if isinstance(frames, pd.Series) else np.array(frames)
-    
-    # Ensure we have an even number of frames (should be pre-validated)
-    if len(frame_values) % 2 != 0:
-        raise ValueError("Expected an even number of frame entries for pairing")
+    return _timeline_from_pairs(*_split_pairs(frames), total_frames)
+
+def generate_timeline_arrays(frames: Union[pd.Series, np.ndarray],
+                             total_frames: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generate the timeline columns as plain NumPy arrays.
     
-    # Create pairs of start and stop frames
-    pairs = [(frame_values[i], frame_values[i+1]) for i in range(0, len(frame_values), 2)]
+    Same data as generate_timeline without the DataFrame wrapper, for callers that
+    only scan the flags or IDs. Element i describes frame i + 1; the frame numbers
+    themselves are implicit.
     
-    # Update timeline for each valid pair
-    for event_id, (start, stop) in enumerate(pairs, 1):
-        # Validate that start <= stop
-        if start > stop:
-            raise ValueError(f"Invalid frame pair at index {event_id-1}: start ({start}) > stop ({stop})")
+    Args:
+        frames: Series or array of frame numbers (assumed to be validated and even in count)
+        total_frames: Total number of frames to consider (N)
         
-        # Ensure frames are within the valid range
-        if start < 1:
-            logger.warning(f"Event {event_id} has start frame ({start}) less than 1. Adjusted to 1.")
-            start = 1
-            
-        if stop > total_frames:
-            logger.warning(f"Event {event_id} has stop frame ({stop}) greater than {total_frames}. Adjusted to {total_frames}.")
-            stop = total_frames
+    Returns:
+        Tuple containing:
+            - GroomingFlag array (uint8, 0 or 1) of length N
+            - EventID array of length N, in the smallest unsigned integer type that
+              holds the number of events
         
-        # Update the timeline for this event
-        mask = (timeline['Frame'] >= start) & (timeline['Frame'] <= stop)
-        timeline.loc[mask, 'GroomingFlag'] = 1
-        timeline.loc[mask, 'EventID'] = event_id
-    
-    return timeline
+    Raises:
+        ValueError: If any pair is invalid (start > stop)
+    """
+    return _timeline_arrays_from_pairs(*_split_pairs(frames), total_frames)
 
-def generate_event_list(frames: pd.Series) -> pd.DataFrame:
+def generate_event_list(frames: Union[pd.Series, np.ndarray]) -> pd.DataFrame:
     """
     Generate an event list from frame data, pairing them as alternating start and stop values.
     
@@ -270,7 +736,7 @@ def generate_event_list(frames: pd.Series) -> pd.DataFrame:
     that corresponds to the EventID used in the timeline.
     
     Args:
-        frames: Series of frame numbers (assumed to be validated and even in count)
+        frames: Series or array of frame numbers (assumed to be validated and even in count)
         
     Returns:
         DataFrame containing event list with columns: EventID, StartFrame, StopFrame
@@ -278,65 +744,121 @@ def generate_event_list(frames: pd.Series) -> pd.DataFrame:
     Raises:
         ValueError: If any pair is invalid (start > stop) or if the input has an odd number of entries
     """
-    # Convert frames to numpy array if it's a pandas Series
-    frame_values = frames.values if isinstance(frames, pd.Series) else np.array(frames)
+    return _event_list_from_pairs(*_split_pairs(frames))
+
+def build_outputs(frames: Union[pd.Series, np.ndarray], total_frames: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Generate both the timeline and the event list from one pass over the frame pairs.
     
-    # Ensure we have an even number of frames
-    if len(frame_values) % 2 != 0:
-        raise ValueError("Expected an even number of frame entries for pairing")
+    Equivalent to calling generate_timeline and generate_event_list, but the frames are
+    paired and validated only once and both tables are built from the same arrays.
     
-    # Create pairs of start and stop frames
-    events = []
-    for i in range(0, len(frame_values), 2):
-        start = frame_values[i]
-        stop = frame_values[i+1]
+    Args:
+        frames: Series or array of frame numbers (assumed to be validated and even in count)
+        total_frames: Total number of frames to consider (N)
         
-        # Validate that start <= stop
-        if start > stop:
-            raise ValueError(f"Invalid frame pair at index {i//2}: start ({start}) > stop ({stop})")
+    Returns:
+        Tuple containing:
+            - Timeline DataFrame (see generate_timeline)
+            - Event list DataFrame (see generate_event_list)
+        
+    Raises:
+        ValueError: If any pair is invalid (start > stop) or if the input has an odd number of entries
+    """
+    starts, stops = _split_pairs(frames)
+    return _timeline_from_pairs(starts, stops, total_frames), _event_list_from_pairs(starts, stops)
+
+class TimelineBuilder:
+    """
+    Build timelines of one fixed length, reusing a working buffer between files.
+    
+    A batch normally uses a single total_frames for every file, so the int64 buffer
+    behind the difference encoding is allocated once and only zero-filled per file.
+    The returned tables own their data and stay valid after later builds. A builder
+    is not thread-safe; use one per thread or process.
+    
+    Args:
+        total_frames: Total number of frames to consider (N)
+    """
+    
+    def __init__(self, total_frames: int):
+        import numpy as np
         
-        # Add the event to our list
-        events.append({
-            'EventID': i//2 + 1,  # Start EventIDs from 1
-            'StartFrame': start,
-            'StopFrame': stop
-        })
+        self.total_frames = total_frames
+        self._scratch = np.empty(total_frames + 1, dtype=np.int64)
     
-    # Create and return the DataFrame
-    return pd.DataFrame(events)
+    def build(self, frames: Union[pd.Series, np.ndarray]) -> pd.DataFrame:
+        """
+        Generate a timeline table, equivalent to generate_timeline.
+        
+        Args:
+            frames: Series or array of frame numbers (assumed to be validated and even in count)
+            
+        Returns:
+            Timeline DataFrame (see generate_timeline)
+            
+        Raises:
+            ValueError: If any pair is invalid (start > stop)
+        """
+        return _timeline_from_pairs(*_split_pairs(frames), self.total_frames, self._scratch)
+    
+    def build_outputs(self, frames: Union[pd.Series, np.ndarray]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Generate the timeline and the event list, equivalent to build_outputs.
+        
+        Args:
+            frames: Series or array of frame numbers (assumed to be validated and even in count)
+            
+        Returns:
+            Tuple of (timeline DataFrame, event list DataFrame)
+            
+        Raises:
+            ValueError: If any pair is invalid (start > stop) or if the input has an odd number of entries
+        """
+        starts, stops = _split_pairs(frames)
+        return (_timeline_from_pairs(starts, stops, self.total_frames, self._scratch),
+                _event_list_from_pairs(starts, stops))
 
-def calculate_file_summary(filename: str, timeline_df: pd.DataFrame, event_list_df: pd.DataFrame, total_frames: int) -> Tuple[Dict[str, Any], List[int]]:
+def calculate_file_summary(filename: str, event_list_df: pd.DataFrame, total_frames: int) -> Tuple[Dict[str, Any], np.ndarray]:
     """
     Calculate summary statistics for a processed file.
     
+    Everything is derived from the event list, so the per-frame timeline is not needed.
+    Events are assumed not to overlap, as guaranteed by process_csv.
+    
     Args:
         filename: Name of the processed file
-        timeline_df: Timeline DataFrame for the file
         event_list_df: Event list DataFrame for the file
         total_frames: Total number of frames considered
         
     Returns:
         Tuple containing:
             - Dictionary with summary statistics for the file
-            - List of event durations for calculating overall statistics
+            - Array of event durations for calculating overall statistics
     """
-    # Calculate event durations
-    event_durations = [(row['StopFrame'] - row['StartFrame'] + 1) for _, row in event_list_df.iterrows()]
+    import numpy as np
+
+    # Calculate event durations in one vectorized pass over the start/stop columns
+    starts = event_list_df['StartFrame'].to_numpy()
+    stops = event_list_df['StopFrame'].to_numpy()
+    durations = stops - starts + 1
     
     # Count of grooming events
     num_events = len(event_list_df)
     
-    # Total grooming duration (in frames)
-    total_grooming_frames = timeline_df['GroomingFlag'].sum()
+    # Total grooming duration (in frames), counting only the part of each event that
+    # falls within frames 1 to total_frames, exactly as the timeline marks them
+    clipped = np.minimum(stops, total_frames) - np.maximum(starts, 1) + 1
+    total_grooming_frames = int(clipped.clip(min=0).sum())
     
     # Average event duration
-    avg_event_duration = np.mean(event_durations) if event_durations else 0
+    avg_event_duration = durations.mean() if durations.size else 0
     
     # Median event duration
-    median_event_duration = np.median(event_durations) if event_durations else 0
+    median_event_duration = np.median(durations) if durations.size else 0
     
     # Standard deviation of event durations
-    std_event_duration = np.std(event_durations) if event_durations else 0
+    std_event_duration = durations.std() if durations.size else 0
     
     # Percentage of grooming frames relative to total
     grooming_percentage = (total_grooming_frames / total_frames) * 100
@@ -352,7 +874,7 @@ def calculate_file_summary(filename: str, timeline_df: pd.DataFrame, event_list_
         'grooming_percentage': float(grooming_percentage)
     }
     
-    return summary, event_durations
+    return summary, durations
 
 def save_summary_report(summary_report: Dict[str, Any], output_dir: Path, total_frames: int) -> None:
     """
@@ -363,6 +885,9 @@ def save_summary_report(summary_report: Dict[str, Any], output_dir: Path, total_
         output_dir: Directory to save the report
         total_frames: Total number of frames considered per file
     """
+    import numpy as np
+    import pandas as pd
+
     # Extract file summaries
     file_summaries = summary_report['file_summaries']
     
@@ -370,14 +895,11 @@ def save_summary_report(summary_report: Dict[str, Any], output_dir: Path, total_
         logger.warning("No files were successfully processed. Cannot generate summary report.")
         return
     
-    # Create DataFrame from file summaries
-    summary_df = pd.DataFrame(file_summaries)
-    
-    # Calculate overall statistics
-    all_event_durations = summary_report['all_event_durations']
+    # Calculate overall statistics directly from the per-file dictionaries
+    all_event_durations = np.asarray(summary_report['all_event_durations'])
     successful_files = summary_report['successful_files']
-    total_events = summary_df['num_events'].sum()
-    total_grooming_frames = summary_df['total_grooming_frames'].sum()
+    total_events = sum(s['num_events'] for s in file_summaries)
+    total_grooming_frames = sum(s['total_grooming_frames'] for s in file_summaries)
     
     # Calculate overall grooming percentage across all files
     overall_grooming_percentage = (total_grooming_frames / (successful_files * total_frames)) * 100 if successful_files > 0 else 0
@@ -387,34 +909,102 @@ def save_summary_report(summary_report: Dict[str, Any], output_dir: Path, total_
         'filename': 'OVERALL',
         'num_events': total_events,
         'total_grooming_frames': int(total_grooming_frames),
-        'avg_event_duration': float(np.mean(all_event_durations)) if all_event_durations else 0,
-        'median_event_duration': float(np.median(all_event_durations)) if all_event_durations else 0,
-        'std_event_duration': float(np.std(all_event_durations)) if all_event_durations else 0,
+        'avg_event_duration': float(np.mean(all_event_durations)) if all_event_durations.size else 0,
+        'median_event_duration': float(np.median(all_event_durations)) if all_event_durations.size else 0,
+        'std_event_duration': float(np.std(all_event_durations)) if all_event_durations.size else 0,
         'grooming_percentage': float(overall_grooming_percentage)
     }
     
-    # Append overall summary to the DataFrame
-    summary_df = pd.concat([summary_df, pd.DataFrame([overall_summary])], ignore_index=True)
+    # Build the report with the overall row in one go rather than concatenating it afterwards
+    summary_df = pd.DataFrame(file_summaries + [overall_summary])
     
     # Save summary report
     summary_file = output_dir / "summary_report.csv"
-    summary_df.to_csv(summary_file, index=False)
-    logger.info(f"Saved consolidated summary report to {summary_file}")
+    summary_df.to_csv(summary_file, index=False, lineterminator='\n')
+    logger.info("Saved consolidated summary report to %s", summary_file)
+    
+def _new_axes(figsize: Tuple[float, float]) -> Axes:
+    """
+    Create a standalone figure with a single set of axes.
+    
+    The figure is built with ``matplotlib.figure.Figure`` rather than pyplot, so
+    no GUI backend is initialised and PNGs are rasterized by Agg. Layout is
+    handled by the figure's tight layout engine on every save.
+    
+    Args:
+        figsize: Figure size in inches as (width, height)
+        
+    Returns:
+        Axes: The axes of the new figure
+    """
+    from matplotlib.figure import Figure
+    
+    fig = Figure(figsize=figsize)
+    fig.set_layout_engine('tight')
+    return fig.subplots()
+
+
+@lru_cache(maxsize=None)
+def _tab10_colors() -> Tuple[Tuple[float, float, float, float], ...]:
+    """
+    Return the ten RGBA colors of matplotlib's 'tab10' palette.
+    
+    Looked up once per process instead of resampling the colormap for every plot.
     
-def generate_timeline_plot(timeline_df: pd.DataFrame, output_path: Path) -> None:
+    Returns:
+        Tuple of RGBA color tuples
+    """
+    import matplotlib
+    
+    colormap = matplotlib.colormaps['tab10']
+    return tuple(colormap(i) for i in range(colormap.N))
+
+
+def _prepare_axes(ax: Optional[Axes], figsize: Tuple[float, float]) -> Axes:
+    """
+    Return axes ready for drawing: cleared if reused, freshly created otherwise.
+    
+    Args:
+        ax: Axes to reuse, or None to create a new figure
+        figsize: Figure size used when a new figure is created
+        
+    Returns:
+        Axes: Empty axes to draw on
+    """
+    import matplotlib
+    
+    if ax is None:
+        return _new_axes(figsize)
+    
+    # Restore the default margins as well as the artists, because the tight
+    # layout engine starts from whatever the previous plot left behind
+    ax.cla()
+    ax.figure.subplots_adjust(**{
+        side: matplotlib.rcParams[f'figure.subplot.{side}']
+        for side in ('left', 'bottom', 'right', 'top')
+    })
+    return ax
+
+
+def generate_timeline_plot(event_list_df: pd.DataFrame, total_frames: int, output_path: Path,
+                           ax: Optional[Axes] = None) -> None:
     """
-    Generate a timeline plot visualizing grooming events from the timeline DataFrame.
+    Generate a timeline plot visualizing grooming events from the event list.
     
     This function creates a horizontal timeline visualization where grooming events
-    are color-coded according to their EventID. The x-axis represents frame numbers,
-    and colored segments indicate frames where grooming occurs.
+    are color-coded according to their EventID. The x-axis represents frame numbers
+    from 1 to total_frames, and colored segments indicate frames where grooming occurs.
+    Events are clipped to that range, and events entirely outside it are not drawn.
     
     Args:
-        timeline_df: DataFrame containing timeline data with columns:
-            - Frame: Frame number
-            - GroomingFlag: Binary indicator (0 = no grooming, 1 = grooming)
+        event_list_df: DataFrame containing event data with columns:
             - EventID: Identifier for each grooming event
+            - StartFrame: Frame where the event begins
+            - StopFrame: Frame where the event ends
+        total_frames: Total number of frames spanned by the timeline
         output_path: Path where the PNG image will be saved
+        ax: Optional axes to draw on. They are cleared first, which lets a batch
+            reuse one figure across files. A new figure is created if omitted.
         
     Returns:
         None. The plot is saved to the specified output path.
@@ -422,98 +1012,75 @@ def generate_timeline_plot(timeline_df: pd.DataFrame, output_path: Path) -> None
     Raises:
         ValueError: If the input DataFrame is empty or doesn't have required columns
     """
-    import matplotlib.pyplot as plt
-    import matplotlib.colors as mcolors
+    global _WARNED_REPEATED_COLORS
+    
     from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
     import numpy as np
     
     # Check if DataFrame is valid
-    if timeline_df is None or timeline_df.empty:
-        raise ValueError("Timeline DataFrame is empty or None")
+    if event_list_df is None or event_list_df.empty:
+        raise ValueError("Event list DataFrame is empty or None")
     
-    required_columns = ['Frame', 'GroomingFlag', 'EventID']
-    if not all(col in timeline_df.columns for col in required_columns):
-        raise ValueError(f"Timeline DataFrame must contain all required columns: {required_columns}")
+    missing = _EVENT_LIST_COLUMNS.difference(event_list_df.columns)
+    if missing:
+        raise ValueError(f"Event list DataFrame is missing required columns: {sorted(missing)}")
     
-    # Create a new figure with appropriate size
-    plt.figure(figsize=(12, 3))
+    # Get empty axes of the appropriate size
+    ax = _prepare_axes(ax, _TIMELINE_FIGSIZE)
+    fig = ax.figure
     
-    # Get unique event IDs (excluding 0, which means no grooming)
-    event_ids = sorted(timeline_df[timeline_df['EventID'] > 0]['EventID'].unique())
+    # Clip events to the timeline and drop those that fall entirely outside it
+    starts = np.maximum(event_list_df['StartFrame'].to_numpy(), 1)
+    stops = np.minimum(event_list_df['StopFrame'].to_numpy(), total_frames)
+    visible = starts <= stops
+    starts, stops = starts[visible], stops[visible]
+    event_ids = event_list_df['EventID'].to_numpy()[visible]
     
-    # Create a colormap for different events (excluding black, which we'll use for non-grooming)
+    # Color events from the tab10 palette in order, cycling when there are more than ten
     num_events = len(event_ids)
-    if num_events > 0:
-        # Choose a colormap that works well for the number of events
-        # Avoid colors that are too light to see
-        colormap = plt.get_cmap('tab10', num_events)
-        colors = [colormap(i) for i in range(num_events)]
-    else:
-        colors = []
-    
-    # Map event IDs to colors
-    event_colors = {event_id: colors[i] for i, event_id in enumerate(event_ids)}
+    palette = _tab10_colors()
+    colors_list = [palette[i % len(palette)] for i in range(num_events)]
+    if num_events > len(palette) and not _WARNED_REPEATED_COLORS:
+        _WARNED_REPEATED_COLORS = True
+        logger.warning("Timeline plots with more than %d events reuse event colors", len(palette))
     
-    # Create segments for each grooming event
-    segments = []
-    colors_list = []
-    
-    # Map event IDs in the timeline to colors
-    for event_id in event_ids:
-        # Get frames for this event
-        event_frames = timeline_df[timeline_df['EventID'] == event_id]['Frame'].values
-        
-        if len(event_frames) > 0:
-            # Determine start and end frames for continuous blocks
-            diffs = np.diff(event_frames)
-            break_points = np.where(diffs > 1)[0]
-            
-            # Extract continuous segments
-            start_idx = 0
-            for end_idx in np.append(break_points, len(event_frames) - 1):
-                segment_start = event_frames[start_idx]
-                segment_end = event_frames[end_idx]
-                
-                # Add segment as a line
-                segments.append([(segment_start, 1), (segment_end, 1)])
-                colors_list.append(event_colors[event_id])
-                
-                start_idx = end_idx + 1
+    # Each event is a single contiguous segment
+    segments = [[(start, 1), (stop, 1)] for start, stop in zip(starts, stops)]
     
     # Create the line collection for the timeline
     if segments:
         lc = LineCollection(segments, colors=colors_list, linewidths=10)
-        plt.gca().add_collection(lc)
+        ax.add_collection(lc)
     
     # Set the axes limits and labels
-    plt.xlim(timeline_df['Frame'].min(), timeline_df['Frame'].max())
-    plt.ylim(0.5, 1.5)
-    plt.yticks([])  # Hide y-axis ticks as they're not meaningful
-    plt.xlabel('Frame Number')
-    plt.title('Grooming Timeline')
+    ax.set_xlim(1, total_frames)
+    ax.set_ylim(0.5, 1.5)
+    ax.set_yticks([])  # Hide y-axis ticks as they're not meaningful
+    ax.set_xlabel('Frame Number')
+    ax.set_title('Grooming Timeline')
     
     # Add a grid to make it easier to identify frame ranges
-    plt.grid(axis='x', alpha=0.3)
+    ax.grid(axis='x', alpha=0.3)
     
     # Create a legend for event IDs
-    if event_ids:
-        legend_elements = [plt.Line2D([0], [0], color=event_colors[event_id], lw=4, 
-                                     label=f'Event {event_id}') 
-                          for event_id in event_ids]
-        plt.legend(handles=legend_elements, loc='upper center', 
-                  bbox_to_anchor=(0.5, -0.15), ncol=min(5, len(event_ids)))
-    
-    # Adjust layout to make room for the legend
-    plt.tight_layout()
-    
-    # Save the figure to the specified output path
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    logger.info(f"Saved timeline plot to {output_path}")
+    if num_events > 0:
+        legend_elements = [Line2D([0], [0], color=color, lw=4, 
+                                  label=f'Event {event_id}') 
+                          for event_id, color in zip(event_ids, colors_list)]
+        ax.legend(handles=legend_elements, loc='upper center', 
+                  bbox_to_anchor=(0.5, -0.15), ncol=min(5, num_events))
+    
+    # Save the figure to the specified output path. The legend sits below the
+    # axes, outside what the layout engine reserves, so the saved area is still
+    # cropped to the drawn artists.
+    fig.savefig(output_path, dpi=300, bbox_inches='tight')
+    
+    logger.info("Saved timeline plot to %s", output_path)
 
 
-def generate_box_plot(event_list_df: pd.DataFrame, output_path: Path) -> None:
+def generate_box_plot(event_list_df: pd.DataFrame, output_path: Path,
+                      ax: Optional[Axes] = None) -> None:
     """
     Generate a box plot showing the distribution of grooming event durations.
     
@@ -526,6 +1093,8 @@ def generate_box_plot(event_list_df: pd.DataFrame, output_path: Path) -> None:
             - StartFrame: Frame where the event begins
             - StopFrame: Frame where the event ends
         output_path: Path where the PNG image will be saved
+        ax: Optional axes to draw on. They are cleared first, which lets a batch
+            reuse one figure across files. A new figure is created if omitted.
         
     Returns:
         None. The plot is saved to the specified output path.
@@ -533,41 +1102,41 @@ def generate_box_plot(event_list_df: pd.DataFrame, output_path: Path) -> None:
     Raises:
         ValueError: If the input DataFrame is empty or doesn't have required columns
     """
-    import matplotlib.pyplot as plt
     import numpy as np
     
     # Check if DataFrame is valid
     if event_list_df is None or event_list_df.empty:
         raise ValueError("Event list DataFrame is empty or None")
     
-    required_columns = ['EventID', 'StartFrame', 'StopFrame']
-    if not all(col in event_list_df.columns for col in required_columns):
-        raise ValueError(f"Event list DataFrame must contain all required columns: {required_columns}")
+    missing = _EVENT_LIST_COLUMNS.difference(event_list_df.columns)
+    if missing:
+        raise ValueError(f"Event list DataFrame is missing required columns: {sorted(missing)}")
     
     # Calculate durations for each event
     durations = event_list_df['StopFrame'] - event_list_df['StartFrame'] + 1
     
-    # Create a new figure
-    plt.figure(figsize=(8, 6))
+    # Get empty axes of the appropriate size
+    ax = _prepare_axes(ax, _BOX_PLOT_FIGSIZE)
+    fig = ax.figure
     
     # Create the box plot
-    box = plt.boxplot(durations, patch_artist=True)
+    box = ax.boxplot(durations, patch_artist=True)
     
     # Customize box plot appearance
     for patch in box['boxes']:
         patch.set_facecolor('lightblue')
     
     # Add individual points to show the raw data distribution
-    plt.scatter(np.ones(len(durations)), durations, 
+    ax.scatter(np.ones(len(durations)), durations, 
                alpha=0.6, color='darkblue', s=30, zorder=3)
     
     # Add labels and title
-    plt.ylabel('Duration (frames)')
-    plt.title('Distribution of Grooming Event Durations')
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.set_ylabel('Duration (frames)')
+    ax.set_title('Distribution of Grooming Event Durations')
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
     
     # Remove x-axis ticks since we only have one category
-    plt.xticks([])
+    ax.set_xticks([])
     
     # Add basic statistics as text
     if len(durations) > 0:
@@ -578,116 +1147,248 @@ def generate_box_plot(event_list_df: pd.DataFrame, output_path: Path) -> None:
             f"Min = {durations.min():.0f}\n"
             f"Max = {durations.max():.0f}"
         )
-        plt.text(1.3, durations.median(), stats_text, 
+        ax.text(1.3, durations.median(), stats_text, 
                 va='center', ha='left', bbox=dict(facecolor='white', alpha=0.8))
     
-    # Adjust layout
-    plt.tight_layout()
-    
     # Save the figure to the specified output path
-    plt.savefig(output_path, dpi=300)
-    plt.close()
+    fig.savefig(output_path, dpi=300)
     
-    logger.info(f"Saved box plot to {output_path}")
+    logger.info("Saved box plot to %s", output_path)
+
+def _write_table(df: pd.DataFrame, path_stem: Path, output_format: str = 'csv') -> Path:
+    """
+    Write a per-file output table in the requested format.
+    
+    CSV remains the default for compatibility. Parquet and Feather are columnar binary
+    formats that are smaller and load back without re-parsing; both require pyarrow.
+    A named index (such as the timeline's 'Frame') is written as the first column,
+    an unnamed default index is dropped.
+    
+    Args:
+        df: Table to write
+        path_stem: Output path without the file extension
+        output_format: One of 'csv', 'parquet' or 'feather'
+        
+    Returns:
+        Path of the written file
+        
+    Raises:
+        ValueError: If the output format is not supported
+    """
+    path = path_stem.parent / f"{path_stem.name}.{output_format}"
+    has_index = df.index.name is not None
+    if output_format == 'csv':
+        df.to_csv(path, index=has_index, lineterminator='\n')
+    elif output_format == 'parquet':
+        # Stored as a real column so non-pandas readers see it too
+        (df.reset_index() if has_index else df).to_parquet(path, index=False, compression='zstd')
+    elif output_format == 'feather':
+        (df.reset_index() if has_index else df).to_feather(path, compression='zstd')
+    else:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    return path
 
-def process_input(input_path: Path, output_path: Path, total_frames: int) -> Dict[str, Any]:
+def _reusable_axes(figsize: Tuple[float, float]) -> Axes:
+    """
+    Return this process's shared axes for plots of the given size.
+    
+    Each process keeps one figure per plot size and the plot functions clear it
+    before drawing, so a batch does not allocate a new figure for every file.
+    
+    Args:
+        figsize: Figure size in inches as (width, height)
+        
+    Returns:
+        Axes: Axes of the shared figure
+    """
+    ax = _SHARED_AXES.get(figsize)
+    if ax is None:
+        ax = _SHARED_AXES[figsize] = _new_axes(figsize)
+    return ax
+
+@lru_cache(maxsize=4)
+def _shared_timeline_builder(total_frames: int) -> TimelineBuilder:
+    """
+    Return this process's timeline builder for the given number of frames.
+    
+    Args:
+        total_frames: Total number of frames to consider
+        
+    Returns:
+        TimelineBuilder: Builder reused for every file of that length
+    """
+    return TimelineBuilder(total_frames)
+
+def _process_one(csv_file: Path, output_path: Path, total_frames: int,
+                 output_format: str = 'csv', cache_dir: Optional[Path] = None,
+                 emit_timeline: bool = True, fast_io: bool = False) -> Tuple[Optional[Dict[str, Any]], np.ndarray, Optional[Dict[str, Any]]]:
+    """
+    Validate a single CSV file and write all of its outputs.
+    
+    Module-level so it can be dispatched to worker processes.
+    
+    Args:
+        csv_file: Path to the CSV file to process
+        output_path: Path to the directory where outputs will be saved
+        total_frames: Total number of frames to consider
+        output_format: File format for the timeline and event tables
+        cache_dir: Optional directory for persisting validated frames between runs
+        emit_timeline: Whether to build and save the per-frame timeline table
+        fast_io: Parse the CSV with pyarrow when it is installed
+        
+    Returns:
+        Tuple containing:
+            - Summary statistics for the file, or None if processing failed
+            - Array of event durations (empty if processing failed)
+            - Error log dictionary if processing failed, None otherwise
+    """
+    import numpy as np
+    
+    logger.info("Processing file: %s", csv_file.name)
+    
+    # Process and validate the CSV file
+    error_log = {}
+    frames = process_csv(csv_file, error_log, cache_dir, fast_io)
+    
+    if frames is None:
+        logger.error("Failed to process %s: %s", csv_file.name, error_log['details'])
+        return None, np.empty(0, dtype=np.int64), error_log
+    
+    try:
+        # Extract filename without extension
+        filename = csv_file.stem
+        
+        # Generate the event list, together with the timeline when its table is
+        # requested; nothing else depends on the timeline, so it is skipped otherwise
+        if emit_timeline:
+            timeline_df, event_list_df = _shared_timeline_builder(total_frames).build_outputs(frames)
+            
+            # Save timeline table
+            timeline_file = _write_table(timeline_df, output_path / f"{filename}_timeline", output_format)
+            logger.info("Saved timeline to %s", timeline_file)
+        else:
+            event_list_df = generate_event_list(frames)
+        
+        # Save event list table
+        events_file = _write_table(event_list_df, output_path / f"{filename}_events", output_format)
+        logger.info("Saved event list to %s", events_file)
+        
+        # Generate and save timeline plot
+        timeline_plot_file = output_path / f"{filename}_timeline.png"
+        generate_timeline_plot(event_list_df, total_frames, timeline_plot_file, _reusable_axes(_TIMELINE_FIGSIZE))
+        
+        # Generate and save box plot
+        box_plot_file = output_path / f"{filename}_boxplot.png"
+        generate_box_plot(event_list_df, box_plot_file, _reusable_axes(_BOX_PLOT_FIGSIZE))
+        
+        # Calculate summary statistics for this file
+        file_summary, event_durations = calculate_file_summary(
+            filename, event_list_df, total_frames
+        )
+        
+        logger.info("Successfully processed %s", csv_file.name)
+        return file_summary, event_durations, None
+        
+    except Exception as e:
+        # Log any errors that occur during processing
+        error_log = {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'filename': csv_file.name,
+            'error_type': 'Processing Error',
+            'details': str(e),
+            'frame': None
+        }
+        logger.error("Error processing %s: %s", csv_file.name, e)
+        return None, np.empty(0, dtype=np.int64), error_log
+
+def process_input(input_path: Path, output_path: Path, total_frames: int,
+                  max_workers: Optional[int] = None, output_format: str = 'csv',
+                  cache_dir: Optional[Path] = None, emit_timeline: bool = True,
+                  fast_io: bool = False) -> Dict[str, Any]:
     """
     Process input file(s) and generate outputs.
     
     This function handles both single files and directories:
     - If input_path is a file, it processes that file only
-    - If input_path is a directory, it processes all CSV files in that directory
+    - If input_path is a directory, it processes all CSV files in that directory,
+      spreading the files across a pool of worker processes
+    
+    Each file is handled end to end (validation, tables, plots, summary) by one worker.
+    Files are submitted largest first so that big files do not end up as stragglers at
+    the tail of the batch; results are still aggregated in sorted filename order.
     
     Args:
         input_path: Path to the input file or directory
         output_path: Path to the directory where outputs will be saved
         total_frames: Total number of frames to consider
+        max_workers: Number of worker processes (default: number of CPUs), capped at the
+            number of files
+        output_format: File format for the timeline and event tables ('csv', 'parquet' or 'feather')
+        cache_dir: Optional directory for persisting validated frames between runs;
+            created if it does not exist
+        emit_timeline: Whether to build and save the per-frame timeline tables
+        fast_io: Parse the CSV files with pyarrow when it is installed
         
     Returns:
         Dictionary containing summary statistics
     """
+    import numpy as np
+    import pandas as pd
+
     # Create output directory - assumes it doesn't exist (checked by validate_args)
     output_path.mkdir(parents=True, exist_ok=False)
     
+    # The validation cache outlives individual runs, so it may already exist
+    if cache_dir is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    
     # Initialize tracking variables
     error_logs = []
     file_summaries = []
     total_files = 0
     successful_files = 0
-    all_event_durations = []  # Collect all event durations for overall stats
+    all_event_duration_arrays = []  # Collect per-file event durations for overall stats
     
     # Determine files to process
     if input_path.is_file():
         files_to_process = [input_path]
     else:
-        files_to_process = list(input_path.glob('*.csv'))
+        # A single scandir pass with a plain suffix test; no fnmatch per entry
+        files_to_process = sorted(p for p in input_path.iterdir()
+                                  if p.suffix.lower() == '.csv' and p.is_file())
+    
+    # Process each file, in parallel when there is more than one
+    worker = partial(_process_one, output_path=output_path, total_frames=total_frames,
+                     output_format=output_format, cache_dir=cache_dir,
+                     emit_timeline=emit_timeline, fast_io=fast_io)
+    # Never start more workers than there are files; the pool forks all of them up front
+    workers = min(max_workers or os.cpu_count() or 1, len(files_to_process))
+    if workers <= 1:
+        results = [worker(csv_file) for csv_file in files_to_process]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        
+        by_size = sorted(files_to_process, key=lambda f: f.stat().st_size, reverse=True)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results_by_file = dict(zip(by_size, executor.map(worker, by_size)))
+        results = [results_by_file[csv_file] for csv_file in files_to_process]
     
-    # Process each file
-    for csv_file in files_to_process:
+    # Aggregate per-file results
+    for file_summary, event_durations, error_log in results:
         total_files += 1
-        logger.info(f"Processing file: {csv_file.name}")
-        
-        # Initialize error log for this file
-        error_log = {}
-        
-        # Process and validate the CSV file
-        frames_df = process_csv(csv_file, error_log)
-        
-        if frames_df is None:
-            # If processing failed, add the error log and continue to next file
+        if error_log is not None:
             error_logs.append(error_log)
-            logger.error(f"Failed to process {csv_file.name}: {error_log['details']}")
             continue
         
-        try:
-            # Extract filename without extension
-            filename = csv_file.stem
-            
-            # Generate timeline
-            timeline_df = generate_timeline(frames_df['Frame'], total_frames)
-            
-            # Generate event list
-            event_list_df = generate_event_list(frames_df['Frame'])
-            
-            # Save timeline to CSV
-            timeline_file = output_path / f"{filename}_timeline.csv"
-            timeline_df.to_csv(timeline_file, index=False)
-            logger.info(f"Saved timeline to {timeline_file}")
-            
-            # Save event list to CSV
-            events_file = output_path / f"{filename}_events.csv"
-            event_list_df.to_csv(events_file, index=False)
-            logger.info(f"Saved event list to {events_file}")
-            
-            # Generate and save timeline plot
-            timeline_plot_file = output_path / f"{filename}_timeline.png"
-            generate_timeline_plot(timeline_df, timeline_plot_file)
-            
-            # Generate and save box plot
-            box_plot_file = output_path / f"{filename}_boxplot.png"
-            generate_box_plot(event_list_df, box_plot_file)
-            
-            # Calculate summary statistics for this file
-            file_summary, event_durations = calculate_file_summary(
-                filename, timeline_df, event_list_df, total_frames
-            )
-            file_summaries.append(file_summary)
-            all_event_durations.extend(event_durations)
-            
-            successful_files += 1
-            logger.info(f"Successfully processed {csv_file.name}")
-            
-        except Exception as e:
-            # Log any errors that occur during processing
-            error_log = {
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'filename': csv_file.name,
-                'error_type': 'Processing Error',
-                'details': str(e),
-                'frame': None
-            }
-            error_logs.append(error_log)
-            logger.error(f"Error processing {csv_file.name}: {str(e)}")
+        file_summaries.append(file_summary)
+        all_event_duration_arrays.append(event_durations)
+        successful_files += 1
+    
+    # Join the per-file durations with a single copy
+    if all_event_duration_arrays:
+        all_event_durations = np.concatenate(all_event_duration_arrays)
+    else:
+        all_event_durations = np.empty(0, dtype=np.int64)
     
     # Generate consolidated summary report
     summary_report = {
@@ -702,8 +1403,8 @@ def process_input(input_path: Path, output_path: Path, total_frames: int) -> Dic
     if error_logs:
         error_log_df = pd.DataFrame(error_logs)
         error_log_file = output_path / "errorLog.csv"
-        error_log_df.to_csv(error_log_file, index=False)
-        logger.info(f"Saved error log to {error_log_file}")
+        error_log_df.to_csv(error_log_file, index=False, lineterminator='\n')
+        logger.info("Saved error log to %s", error_log_file)
     
     # Save consolidated summary report
     save_summary_report(summary_report, output_path, total_frames)
@@ -729,6 +1430,7 @@ def main():
     
     input_path = Path(args.input)
     output_path = Path(args.output)
+    cache_dir = Path(args.cache_dir) if args.cache_dir else None
     
     print(f"Starting processing...")
     print(f"Input: {args.input}")
@@ -737,7 +1439,9 @@ def main():
     
     try:
         # Process the input (file or directory)
-        summary = process_input(input_path, output_path, args.total_frames)
+        summary = process_input(input_path, output_path, args.total_frames, args.workers,
+                                args.output_format, cache_dir, not args.skip_timeline,
+                                args.fast_io)
         
         # Print processing summary
         print(f"\nProcessing complete.")
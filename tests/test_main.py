@@ -5,154 +5,231 @@ Test cases for the Behavioral Annotation Data Conversion Tool.
 import pytest
 import pandas as pd
 import numpy as np
-import tempfile
-import os
-import sys
 import io
+import concurrent.futures
 import contextlib
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
 
-# Add the parent directory to sys.path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 # Import the module to test
 from main import (process_csv, DataValidationError, generate_timeline, generate_event_list,
-                 calculate_file_summary, process_input, generate_timeline_plot, generate_box_plot)
-
-@pytest.fixture
-def valid_csv():
-    """Create a temporary CSV file with valid frame data."""
-    with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as temp:
-        # Create valid CSV with even number of entries in increasing order
-        df = pd.DataFrame({
-            'Number': [1, 2, 3, 4],
-            'Area': [100, 100, 100, 100],
-            'Mean': [0.5, 0.5, 0.5, 0.5],
-            'Min': [0, 0, 0, 0],
-            'Max': [1, 1, 1, 1],
-            'X': [10, 10, 10, 10],
-            'Y': [20, 20, 20, 20],
-            'Ch': [1, 1, 1, 1],
-            'Frame': [100, 150, 200, 250]  # Strictly increasing frame numbers
-        })
-        df.to_csv(temp.name, index=False)
-        yield temp.name
-        # Clean up
-        os.unlink(temp.name)
-
-@pytest.fixture
-def no_frame_column_csv():
-    """Create a temporary CSV file missing the 'Frame' column."""
-    with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as temp:
-        df = pd.DataFrame({
-            'Number': [1, 2, 3, 4],
-            'Area': [100, 100, 100, 100],
-            # Missing 'Frame' column
-        })
-        df.to_csv(temp.name, index=False)
-        yield temp.name
-        os.unlink(temp.name)
+                 calculate_file_summary, process_input, generate_timeline_plot, generate_box_plot,
+                 build_outputs, generate_timeline_arrays, TimelineBuilder, _first_nonincreasing, _new_axes, _TIMELINE_FIGSIZE)
 
-@pytest.fixture
-def non_numeric_frame_csv():
-    """Create a temporary CSV file with non-numeric values in the 'Frame' column."""
-    with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as temp:
-        df = pd.DataFrame({
-            'Number': [1, 2, 3, 4],
-            'Frame': [100, 'abc', 200, 250]  # Non-numeric value
-        })
-        df.to_csv(temp.name, index=False)
-        yield temp.name
-        os.unlink(temp.name)
+def _write_session_csv(tmp_path_factory, name, df):
+    """Write a read-only fixture CSV once per test session."""
+    path = tmp_path_factory.mktemp("csvs") / name
+    df.to_csv(path, index=False)
+    return str(path)
 
-@pytest.fixture
-def odd_entries_csv():
-    """Create a temporary CSV file with an odd number of frame entries."""
-    with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as temp:
-        df = pd.DataFrame({
-            'Number': [1, 2, 3],
-            'Frame': [100, 150, 200]  # Odd number of entries
-        })
-        df.to_csv(temp.name, index=False)
-        yield temp.name
-        os.unlink(temp.name)
+@pytest.fixture(scope="session")
+def valid_csv(tmp_path_factory):
+    """Create a temporary CSV file with valid frame data."""
+    # Create valid CSV with even number of entries in increasing order
+    df = pd.DataFrame({
+        'Number': [1, 2, 3, 4],
+        'Area': [100, 100, 100, 100],
+        'Mean': [0.5, 0.5, 0.5, 0.5],
+        'Min': [0, 0, 0, 0],
+        'Max': [1, 1, 1, 1],
+        'X': [10, 10, 10, 10],
+        'Y': [20, 20, 20, 20],
+        'Ch': [1, 1, 1, 1],
+        'Frame': [100, 150, 200, 250]  # Strictly increasing frame numbers
+    })
+    return _write_session_csv(tmp_path_factory, "valid.csv", df)
 
-@pytest.fixture
-def non_increasing_frames_csv():
-    """Create a temporary CSV file with non-increasing frame numbers."""
-    with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as temp:
-        df = pd.DataFrame({
-            'Number': [1, 2, 3, 4],
-            'Frame': [100, 150, 140, 250]  # Third value (140) is less than second (150)
-        })
-        df.to_csv(temp.name, index=False)
-        yield temp.name
-        os.unlink(temp.name)
+@pytest.fixture(scope="session")
+def processed_valid(valid_csv):
+    """Parse the valid CSV once and build its 500-frame timeline and event list."""
+    frames = process_csv(valid_csv)
+    timeline, event_list = build_outputs(frames, 500)
+    return frames, timeline, event_list
 
 @pytest.fixture
 def sample_frames():
     """Create sample frame data for timeline generation tests."""
-    return pd.Series([100, 200, 300, 400])  # Two events: (100-200) and (300-400)
+    return np.array([100, 200, 300, 400], dtype=np.int64)  # Two events: (100-200) and (300-400)
 
 @pytest.fixture
 def invalid_frame_pair():
     """Create sample frame data with an invalid pair (start > stop)."""
-    return pd.Series([200, 100, 300, 400])  # First pair is invalid: 200 > 100
+    return np.array([200, 100, 300, 400], dtype=np.int64)  # First pair is invalid: 200 > 100
 
 @pytest.fixture
 def out_of_range_frames():
     """Create sample frame data with frames outside the valid range."""
-    return pd.Series([0, 50, 480, 600])  # One event starts before 1, one ends after total_frames=500
+    return np.array([0, 50, 480, 600], dtype=np.int64)  # One event starts before 1, one ends after total_frames=500
 
 def test_valid_csv(valid_csv):
     """Test processing of a valid CSV file."""
     result = process_csv(valid_csv)
     assert result is not None
-    assert 'Frame' in result.columns
-    assert len(result) == 4
-    assert list(result['Frame']) == [100, 150, 200, 250]
+    assert isinstance(result, np.ndarray)
+    assert result.dtype == np.int64
+    assert not result.flags.writeable
+    assert list(result) == [100, 150, 200, 250]
+
+@pytest.mark.parametrize("make_buffer", [io.StringIO, lambda text: io.BytesIO(text.encode())])
+def test_process_csv_buffer(make_buffer, tmp_path):
+    """Test that in-memory text and binary buffers are accepted like file paths."""
+    result = process_csv(make_buffer("Number,Frame\n1,100\n2,150\n3,200\n4,250\n"), cache_dir=tmp_path)
+    assert list(result) == [100, 150, 200, 250]
+    # Buffers have no path or modification time, so nothing is cached on disk
+    assert list(tmp_path.iterdir()) == []
 
-def test_missing_frame_column(no_frame_column_csv):
-    """Test validation of a CSV file missing the 'Frame' column."""
     error_log = {}
-    result = process_csv(no_frame_column_csv, error_log)
-    assert result is None
-    assert error_log['error_type'] == 'Missing Column'
-    # Test without error_log (should raise exception)
-    with pytest.raises(DataValidationError):
-        process_csv(no_frame_column_csv)
-
-def test_non_numeric_frame(non_numeric_frame_csv):
-    """Test validation of a CSV file with non-numeric values in the 'Frame' column."""
-    error_log = {}
-    result = process_csv(non_numeric_frame_csv, error_log)
-    assert result is None
-    assert error_log['error_type'] == 'Non-numeric Values'
-    # Test without error_log (should raise exception)
-    with pytest.raises(DataValidationError):
-        process_csv(non_numeric_frame_csv)
-
-def test_odd_entries(odd_entries_csv):
-    """Test validation of a CSV file with an odd number of frame entries."""
-    error_log = {}
-    result = process_csv(odd_entries_csv, error_log)
-    assert result is None
+    assert process_csv(make_buffer("Number,Frame\n1,100\n2,150\n3,200\n"), error_log) is None
+    assert error_log['filename'] == '<buffer>'
     assert error_log['error_type'] == 'Odd Entry Count'
-    # Test without error_log (should raise exception)
-    with pytest.raises(DataValidationError):
-        process_csv(odd_entries_csv)
 
-def test_non_increasing_frames(non_increasing_frames_csv):
-    """Test validation of a CSV file with non-increasing frame numbers."""
+@pytest.mark.parametrize("content, error_type, details, frame", [
+    pytest.param("Number,Area\n1,100\n2,100\n3,100\n4,100\n",
+                 'Missing Column', "missing the 'Frame' column", None, id="missing_frame_column"),
+    pytest.param("Number,Frame\n1,100\n2,abc\n3,200\n4,250\n",
+                 'Non-numeric Values', "non-numeric values", None, id="non_numeric_frame"),
+    pytest.param("Number,Frame\n1,100\n2,\n3,200\n4,250\n",
+                 'Non-numeric Values', "non-numeric values", None, id="blank_frame_value"),
+    # Undecodable bytes in any column are a file problem, not a non-numeric frame
+    pytest.param("Name,Frame\ncaf\xe9,100\nx,150\n".encode('latin-1'),
+                 'Processing Error', "codec can't decode", None, id="non_utf8_bytes"),
+    pytest.param("Number,Frame\n1,100\n2,150\n3,200\n",
+                 'Odd Entry Count', "odd number of frame entries (3)", None, id="odd_entries"),
+    # Third value (140) is less than second (150)
+    pytest.param("Number,Frame\n1,100\n2,150\n3,140\n4,250\n",
+                 'Non-increasing Frames', "non-increasing frame numbers at position 2", 140,
+                 id="non_increasing_frames"),
+])
+def test_process_csv_validation(content, error_type, details, frame):
+    """Test that each invalid input is logged with its error type, or raised without a log."""
+    make_buffer = io.BytesIO if isinstance(content, bytes) else io.StringIO
     error_log = {}
-    result = process_csv(non_increasing_frames_csv, error_log)
+    result = process_csv(make_buffer(content), error_log)
     assert result is None
-    assert error_log['error_type'] == 'Non-increasing Frames'
-    assert error_log['frame'] == 140  # The problematic frame
+    assert error_log['error_type'] == error_type
+    assert details in error_log['details']
+    assert error_log['frame'] == frame
     # Test without error_log (should raise exception)
     with pytest.raises(DataValidationError):
-        process_csv(non_increasing_frames_csv)
+        process_csv(make_buffer(content))
+
+def test_duplicate_content_parsed_once(tmp_path, monkeypatch):
+    """Test that files with identical content are only parsed once."""
+    monkeypatch.setattr("main._VALIDATION_CACHE", OrderedDict())
+    content = pd.DataFrame({'Frame': [11, 22, 33, 44, 55, 66]})
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+    create_test_file(first, content)
+    create_test_file(second, content)
+    
+    calls = []
+    original_read_csv = pd.read_csv
+    def counting_read_csv(*args, **kwargs):
+        calls.append(args)
+        return original_read_csv(*args, **kwargs)
+    monkeypatch.setattr(pd, 'read_csv', counting_read_csv)
+    
+    first_result = process_csv(first)
+    second_result = process_csv(second)
+    
+    assert len(calls) == 1
+    assert list(first_result) == list(second_result) == [11, 22, 33, 44, 55, 66]
+
+def test_validation_cache_is_bounded(monkeypatch):
+    """Test that the content cache evicts its least recently used entry when full."""
+    cache = OrderedDict()
+    monkeypatch.setattr("main._VALIDATION_CACHE", cache)
+    monkeypatch.setattr("main._VALIDATION_CACHE_SIZE", 2)
+
+    process_csv(io.StringIO("Frame\n1\n2\n"))
+    first = next(iter(cache))
+    process_csv(io.StringIO("Frame\n3\n4\n"))
+    # A cache hit makes the first entry the most recently used
+    process_csv(io.StringIO("Frame\n1\n2\n"))
+    process_csv(io.StringIO("Frame\n5\n6\n"))
+
+    assert len(cache) == 2
+    assert first in cache
+
+def test_disk_cache_reused_until_file_changes(tmp_path, monkeypatch):
+    """Test that the disk cache skips unchanged files and re-reads modified ones."""
+    csv_path = tmp_path / "cached.csv"
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    create_test_file(csv_path, pd.DataFrame({'Frame': [10, 20, 30, 40]}))
+    
+    calls = []
+    original_read_csv = pd.read_csv
+    def counting_read_csv(*args, **kwargs):
+        calls.append(args)
+        return original_read_csv(*args, **kwargs)
+    monkeypatch.setattr(pd, 'read_csv', counting_read_csv)
+    
+    # First run populates the cache, a later run (fresh process cache) reuses it
+    monkeypatch.setattr("main._VALIDATION_CACHE", OrderedDict())
+    assert list(process_csv(csv_path, cache_dir=cache_dir)) == [10, 20, 30, 40]
+    monkeypatch.setattr("main._VALIDATION_CACHE", OrderedDict())
+    cached = process_csv(csv_path, cache_dir=cache_dir)
+    assert list(cached) == [10, 20, 30, 40]
+    assert not cached.flags.writeable
+    assert len(calls) == 1
+    
+    # Rewriting the file changes its size and invalidates the entry
+    create_test_file(csv_path, pd.DataFrame({'Frame': [10, 20, 30, 400]}))
+    assert list(process_csv(csv_path, cache_dir=cache_dir)) == [10, 20, 30, 400]
+    assert len(calls) == 2
+
+def test_memory_mapped_csv(valid_csv, monkeypatch):
+    """Test that files above the mmap threshold are parsed identically."""
+    monkeypatch.setattr("main._MMAP_THRESHOLD", 0)
+    monkeypatch.setattr("main._VALIDATION_CACHE", OrderedDict())
+    result = process_csv(valid_csv)
+    assert list(result) == [100, 150, 200, 250]
+
+@pytest.mark.parametrize("content", [
+    "Number,Area,Frame\n1,5,100\n2,6,150\n3,7,200\n4,8,250\n",
+    "Number,Frame\n1,100\n2,abc\n",
+    "Number,Frame\n1,100\n2,\n3,200\n4,250\n",
+    "Number,Area\n1,100\n2,150\n",
+    "Number,Frame\n1,100\n2,150\n3,200\n",
+    "Number,Frame\n1,100\n2,150\n3,150\n4,250\n",
+    "Number,Frame\n1,0x10\n2,150\n",
+    "Number,Frame\n1, 100\n2,+150\n3,200 \n4,250\n",
+    # Latin-1 bytes outside 'Frame', in a value and in a header name
+    "Name,Frame\ncaf\xe9,100\nx,150\n".encode('latin-1'),
+    "Nom\xe9,Frame\na,100\nb,150\n".encode('latin-1'),
+])
+@pytest.mark.parametrize("mmap_threshold", [0, 1 << 30])
+def test_fast_io_matches_default_parser(tmp_path, monkeypatch, content, mmap_threshold):
+    """Test that the optional pyarrow reader gives the same results and errors."""
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr("main._MMAP_THRESHOLD", mmap_threshold)
+    csv_path = tmp_path / "annotations.csv"
+    if isinstance(content, bytes):
+        csv_path.write_bytes(content)
+    else:
+        csv_path.write_text(content)
+    
+    results = []
+    for fast_io in (False, True):
+        monkeypatch.setattr("main._VALIDATION_CACHE", OrderedDict())
+        error_log = {}
+        frames = process_csv(csv_path, error_log, fast_io=fast_io)
+        results.append((None if frames is None else list(frames), error_log))
+    
+    assert results[0] == results[1]
+
+def test_first_nonincreasing_across_blocks(monkeypatch):
+    """Test that ordering violations are located correctly at block boundaries."""
+    monkeypatch.setattr("main._SCAN_BLOCK", 4)
+    arr = np.arange(1, 21, dtype=np.int64)
+    assert _first_nonincreasing(arr) == -1
+    for bad_index in (1, 4, 5, 8, 19):
+        broken = arr.copy()
+        broken[bad_index] = broken[bad_index - 1]
+        assert _first_nonincreasing(broken) == bad_index
+    assert _first_nonincreasing(np.array([], dtype=np.int64)) == -1
 
 def test_generate_timeline_basic(sample_frames):
     """Test basic functionality of generate_timeline with valid input."""
@@ -161,27 +238,44 @@ def test_generate_timeline_basic(sample_frames):
     
     # Verify timeline has correct shape and columns
     assert len(timeline) == total_frames
-    assert all(col in timeline.columns for col in ['Frame', 'GroomingFlag', 'EventID'])
-    
-    # Verify frames 1-99 have no grooming
-    assert all(timeline.loc[0:98, 'GroomingFlag'] == 0)
-    assert all(timeline.loc[0:98, 'EventID'] == 0)
-    
-    # Verify frames 100-200 have grooming with EventID 1
-    assert all(timeline.loc[99:199, 'GroomingFlag'] == 1)
-    assert all(timeline.loc[99:199, 'EventID'] == 1)
-    
-    # Verify frames 201-299 have no grooming
-    assert all(timeline.loc[200:298, 'GroomingFlag'] == 0)
-    assert all(timeline.loc[200:298, 'EventID'] == 0)
-    
-    # Verify frames 300-400 have grooming with EventID 2
-    assert all(timeline.loc[299:399, 'GroomingFlag'] == 1)
-    assert all(timeline.loc[299:399, 'EventID'] == 2)
-    
-    # Verify frames 401-500 have no grooming
-    assert all(timeline.loc[400:499, 'GroomingFlag'] == 0)
-    assert all(timeline.loc[400:499, 'EventID'] == 0)
+    assert timeline.index.name == 'Frame'
+    assert all(col in timeline.columns for col in ['GroomingFlag', 'EventID'])
+    
+    # Frames 100-200 belong to event 1 and frames 300-400 to event 2; all others
+    # have no grooming. Frame f is at position f - 1.
+    expected_ids = np.zeros(total_frames, dtype=np.int64)
+    expected_ids[99:200] = 1
+    expected_ids[299:400] = 2
+    np.testing.assert_array_equal(timeline['EventID'].to_numpy(), expected_ids)
+    np.testing.assert_array_equal(timeline['GroomingFlag'].to_numpy(), (expected_ids != 0).astype(np.uint8))
+
+def test_generate_timeline_float_frames():
+    """Test that a Series of float frame numbers is accepted like integer frames."""
+    timeline = generate_timeline(pd.Series([1.0, 5.0, 7.0, 9.0]), 10)
+    
+    assert list(timeline['EventID']) == [1, 1, 1, 1, 1, 0, 2, 2, 2, 0]
+    assert list(timeline['GroomingFlag']) == [1, 1, 1, 1, 1, 0, 1, 1, 1, 0]
+
+def test_generate_timeline_dtypes():
+    """Test that timeline columns use the narrowest sufficient integer types."""
+    few = generate_timeline(np.array([1, 2, 5, 6]), 10)
+    assert few['GroomingFlag'].dtype == np.uint8
+    assert few['EventID'].dtype == np.uint8
+    
+    # 300 one-frame events no longer fit in uint8
+    many = generate_timeline(np.repeat(np.arange(1, 301), 2), 300)
+    assert many['EventID'].dtype == np.uint16
+    assert many['EventID'].iloc[-1] == 300
+
+def test_generate_timeline_arrays(sample_frames):
+    """Test that the array form holds the same data as the timeline DataFrame."""
+    grooming_flag, event_ids = generate_timeline_arrays(sample_frames, 500)
+    timeline = generate_timeline(sample_frames, 500)
+    
+    assert isinstance(grooming_flag, np.ndarray)
+    np.testing.assert_array_equal(grooming_flag, timeline['GroomingFlag'].to_numpy())
+    np.testing.assert_array_equal(event_ids, timeline['EventID'].to_numpy())
+    assert grooming_flag.dtype == np.uint8
 
 def test_generate_timeline_invalid_pair(invalid_frame_pair):
     """Test generate_timeline with invalid frame pair (start > stop)."""
@@ -194,66 +288,74 @@ def test_generate_timeline_invalid_pair(invalid_frame_pair):
     # Check that the error message mentions the invalid pair
     assert "start (200) > stop (100)" in str(excinfo.value)
 
-def test_generate_timeline_out_of_range(out_of_range_frames):
+def test_generate_timeline_out_of_range(out_of_range_frames, caplog):
     """Test generate_timeline with frames outside the valid range."""
     total_frames = 500
     
     # The function should adjust the ranges to be within bounds
     # but we need to capture warnings to verify they're logged properly
-    timeline = generate_timeline(out_of_range_frames, total_frames)
+    with caplog.at_level("WARNING", logger="main"):
+        timeline = generate_timeline(out_of_range_frames, total_frames)
+    
+    # Both adjusted events are reported in a single warning
+    warnings = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+    assert warnings == ["Events [1, 2] extend beyond frames 1 to 500. Adjusted to that range."]
     
     # First event should be adjusted to start at frame 1 instead of 0
-    assert timeline.loc[0, 'GroomingFlag'] == 1
-    assert timeline.loc[0, 'EventID'] == 1
+    assert timeline.loc[1, 'GroomingFlag'] == 1
+    assert timeline.loc[1, 'EventID'] == 1
     
     # Second event should be truncated to end at frame 500 instead of 600
-    assert timeline.loc[479, 'GroomingFlag'] == 1  # Frame 480
-    assert timeline.loc[479, 'EventID'] == 2
-    assert timeline.loc[499, 'GroomingFlag'] == 1  # Frame 500
-    assert timeline.loc[499, 'EventID'] == 2
+    assert timeline.loc[480, 'GroomingFlag'] == 1  # Frame 480
+    assert timeline.loc[480, 'EventID'] == 2
+    assert timeline.loc[500, 'GroomingFlag'] == 1  # Frame 500
+    assert timeline.loc[500, 'EventID'] == 2
 
-def test_timeline_from_csv_file(valid_csv):
-    """Test end-to-end processing from CSV file to timeline generation."""
+def test_generate_timeline_events_outside_range():
+    """Test that events lying entirely outside 1..N leave the timeline untouched."""
     total_frames = 500
+    timeline = generate_timeline(pd.Series([-10, -5, 10, 20, 600, 700]), total_frames)
     
-    # Process the CSV file
-    frames_df = process_csv(valid_csv)
-    assert frames_df is not None
+    assert timeline['GroomingFlag'].sum() == 11  # Only frames 10-20
+    assert set(timeline['EventID'].unique()) == {0, 2}
+
+def test_generate_timeline_overlapping_events():
+    """Test that overlapping (unvalidated) events are drawn with later events on top."""
+    timeline = generate_timeline(np.array([1, 10, 5, 6, 8, 12]), 15)
     
-    # Generate timeline from the processed frames
-    timeline = generate_timeline(frames_df['Frame'], total_frames)
+    assert list(timeline['EventID']) == [1, 1, 1, 1, 2, 2, 1, 3, 3, 3, 3, 3, 0, 0, 0]
+    assert list(timeline['GroomingFlag']) == [1] * 12 + [0] * 3
+
+def test_timeline_from_csv_file(processed_valid):
+    """Test end-to-end processing from CSV file to timeline generation."""
+    total_frames = 500
+    frames, timeline, _ = processed_valid
+    assert frames is not None
     
     # Verify the timeline has expected structure
     assert len(timeline) == total_frames
-    assert all(col in timeline.columns for col in ['Frame', 'GroomingFlag', 'EventID'])
+    assert timeline.index.name == 'Frame'
+    assert all(col in timeline.columns for col in ['GroomingFlag', 'EventID'])
     
-    # Verify events are correctly marked in the timeline
-    # First event: frames 100-150
-    assert all(timeline.loc[99:149, 'GroomingFlag'] == 1)
-    assert all(timeline.loc[99:149, 'EventID'] == 1)
-    
-    # Second event: frames 200-250
-    assert all(timeline.loc[199:249, 'GroomingFlag'] == 1)
-    assert all(timeline.loc[199:249, 'EventID'] == 2)
+    # Verify events are correctly marked in the timeline: frames 100-150 belong to
+    # event 1 and frames 200-250 to event 2
+    expected_ids = np.zeros(total_frames, dtype=np.int64)
+    expected_ids[99:150] = 1
+    expected_ids[199:250] = 2
+    np.testing.assert_array_equal(timeline['EventID'].to_numpy(), expected_ids)
+    np.testing.assert_array_equal(timeline['GroomingFlag'].to_numpy(), (expected_ids != 0).astype(np.uint8))
 
 def test_generate_event_list_basic(sample_frames):
     """Test basic functionality of generate_event_list with valid input."""
     # Sample frames is [100, 200, 300, 400] representing two events
     event_list = generate_event_list(sample_frames)
     
-    # Verify event list has correct shape and columns
-    assert len(event_list) == 2  # Should have 2 events
-    assert all(col in event_list.columns for col in ['EventID', 'StartFrame', 'StopFrame'])
-    
-    # Verify first event
-    assert event_list.loc[0, 'EventID'] == 1
-    assert event_list.loc[0, 'StartFrame'] == 100
-    assert event_list.loc[0, 'StopFrame'] == 200
-    
-    # Verify second event
-    assert event_list.loc[1, 'EventID'] == 2
-    assert event_list.loc[1, 'StartFrame'] == 300
-    assert event_list.loc[1, 'StopFrame'] == 400
+    expected = pd.DataFrame({
+        'EventID': [1, 2],
+        'StartFrame': [100, 300],
+        'StopFrame': [200, 400]
+    })
+    pd.testing.assert_frame_equal(event_list, expected)
 
 def test_generate_event_list_invalid_pair(invalid_frame_pair):
     """Test generate_event_list with invalid frame pair (start > stop)."""
@@ -275,43 +377,49 @@ def test_generate_event_list_odd_entries():
     # Check that the error message mentions even number of entries
     assert "even number" in str(excinfo.value).lower()
 
-def test_event_list_from_csv_file(valid_csv):
+def test_event_list_from_csv_file(processed_valid):
     """Test end-to-end processing from CSV file to event list generation."""
-    # Process the CSV file
-    frames_df = process_csv(valid_csv)
-    assert frames_df is not None
-    
-    # Generate event list from the processed frames
-    event_list = generate_event_list(frames_df['Frame'])
-    
-    # Verify the event list has expected structure
-    assert len(event_list) == 2  # Should have 2 events
-    assert all(col in event_list.columns for col in ['EventID', 'StartFrame', 'StopFrame'])
-    
-    # Verify first event
-    assert event_list.loc[0, 'EventID'] == 1
-    assert event_list.loc[0, 'StartFrame'] == 100
-    assert event_list.loc[0, 'StopFrame'] == 150
+    frames, _, event_list = processed_valid
+    assert frames is not None
     
-    # Verify second event
-    assert event_list.loc[1, 'EventID'] == 2
-    assert event_list.loc[1, 'StartFrame'] == 200
-    assert event_list.loc[1, 'StopFrame'] == 250
+    expected = pd.DataFrame({
+        'EventID': [1, 2],
+        'StartFrame': [100, 200],
+        'StopFrame': [150, 250]
+    })
+    pd.testing.assert_frame_equal(event_list, expected)
 
 # Helper function for batch processing tests
 def create_test_file(path, df):
     """Helper function to create test CSV files."""
     df.to_csv(path, index=False)
 
+def test_build_outputs_matches_separate_functions(sample_frames):
+    """Test that the fused builder returns the same tables as the separate functions."""
+    timeline, event_list = build_outputs(sample_frames, 500)
+    
+    pd.testing.assert_frame_equal(timeline, generate_timeline(sample_frames, 500))
+    pd.testing.assert_frame_equal(event_list, generate_event_list(sample_frames))
+
+def test_build_outputs_invalid_pair(invalid_frame_pair):
+    """Test that the fused builder rejects invalid pairs like the separate functions."""
+    with pytest.raises(ValueError, match=r"start \(200\) > stop \(100\)"):
+        build_outputs(invalid_frame_pair, 500)
+
+def test_timeline_builder_reuse(sample_frames):
+    """Test that a reused builder matches generate_timeline and does not alias results."""
+    builder = TimelineBuilder(500)
+    first = builder.build(sample_frames)
+    second, event_list = builder.build_outputs(pd.Series([1, 5, 450, 600]))
+    
+    # Building the second timeline must not disturb the first
+    pd.testing.assert_frame_equal(first, generate_timeline(sample_frames, 500))
+    pd.testing.assert_frame_equal(second, generate_timeline(pd.Series([1, 5, 450, 600]), 500))
+    pd.testing.assert_frame_equal(event_list, generate_event_list(pd.Series([1, 5, 450, 600])))
+
 def test_calculate_file_summary():
     """Test the calculation of file summary statistics."""
     # Create sample data
-    timeline_df = pd.DataFrame({
-        'Frame': range(1, 101),
-        'GroomingFlag': [1] * 30 + [0] * 40 + [1] * 20 + [0] * 10,
-        'EventID': [1] * 30 + [0] * 40 + [2] * 20 + [0] * 10
-    })
-    
     event_list_df = pd.DataFrame({
         'EventID': [1, 2],
         'StartFrame': [1, 71],
@@ -322,7 +430,7 @@ def test_calculate_file_summary():
     filename = "test_file"
     
     # Calculate summary
-    summary, event_durations = calculate_file_summary(filename, timeline_df, event_list_df, total_frames)
+    summary, event_durations = calculate_file_summary(filename, event_list_df, total_frames)
     
     # Verify summary results
     assert summary['filename'] == filename
@@ -331,10 +439,33 @@ def test_calculate_file_summary():
     assert summary['grooming_percentage'] == 50.0  # 50/100 * 100
     
     # Verify event durations
-    assert event_durations == [30, 20]  # (30-1+1), (90-71+1)
+    assert list(event_durations) == [30, 20]  # (30-1+1), (90-71+1)
+
+def test_calculate_file_summary_matches_timeline():
+    """Test that grooming frames are counted as the clipped timeline marks them."""
+    frames = np.array([-10, -5, -3, 4, 10, 20, 95, 120, 200, 210])
+    total_frames = 100
+    timeline = generate_timeline(frames, total_frames)
+    
+    summary, _ = calculate_file_summary("clipped", generate_event_list(frames), total_frames)
+    
+    assert summary['total_grooming_frames'] == timeline['GroomingFlag'].sum() == 21
+
+def _fake_timeline_plot(event_list_df, total_frames, output_path, ax=None):
+    """Stand in for generate_timeline_plot by writing a PNG signature to its output path."""
+    Path(output_path).write_bytes(b"\x89PNG")
 
-def test_process_input(tmp_path):
+def _fake_box_plot(event_list_df, output_path, ax=None):
+    """Stand in for generate_box_plot by writing a PNG signature to its output path."""
+    Path(output_path).write_bytes(b"\x89PNG")
+
+def test_process_input(tmp_path, monkeypatch):
     """Test batch processing of multiple files."""
+    # Rendering is covered by the plotting tests; here only the output files matter.
+    # The files are processed in this process so the patched functions are used.
+    monkeypatch.setattr("main.generate_timeline_plot", _fake_timeline_plot)
+    monkeypatch.setattr("main.generate_box_plot", _fake_box_plot)
+    
     # Create test directories
     input_dir = tmp_path / "input"
     input_dir.mkdir()
@@ -363,7 +494,7 @@ def test_process_input(tmp_path):
     }))
     
     # Process the directory
-    summary = process_input(input_dir, output_dir, 500)
+    summary = process_input(input_dir, output_dir, 500, max_workers=1)
     
     # Verify summary statistics
     assert summary['total_files'] == 4
@@ -395,6 +526,46 @@ def test_process_input(tmp_path):
     assert "invalid1.csv" in invalid_files_in_log
     assert "invalid2.csv" in invalid_files_in_log
 
+def test_process_input_selects_csv_files(tmp_path):
+    """Test that only regular files with a .csv suffix (any case) are processed."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    create_test_file(input_dir / "lower.csv", pd.DataFrame({'Frame': [1, 5]}))
+    create_test_file(input_dir / "upper.CSV", pd.DataFrame({'Frame': [1, 5]}))
+    (input_dir / "notes.txt").write_text("Frame\n1\n5\n")
+    (input_dir / "folder.csv").mkdir()
+    
+    summary = process_input(input_dir, tmp_path / "output", 10, max_workers=1)
+    
+    assert summary['total_files'] == 2
+    assert [s['filename'] for s in summary['file_summaries']] == ['lower', 'upper']
+
+def test_process_input_serial_matches_parallel(tmp_path, monkeypatch):
+    """Test that serial and parallel validation produce the same summary."""
+    # Record the size of each pool process_input starts
+    pool_sizes = []
+    class RecordingPool(concurrent.futures.ProcessPoolExecutor):
+        def __init__(self, max_workers=None, **kwargs):
+            pool_sizes.append(max_workers)
+            super().__init__(max_workers=max_workers, **kwargs)
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", RecordingPool)
+    
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    
+    create_test_file(input_dir / "a.csv", pd.DataFrame({'Frame': [10, 20, 30, 40]}))
+    create_test_file(input_dir / "b.csv", pd.DataFrame({'Frame': [5, 50, 60, 90]}))
+    create_test_file(input_dir / "c.csv", pd.DataFrame({'Frame': [100, 90]}))  # Non-increasing
+    
+    serial = process_input(input_dir, tmp_path / "serial", 100, max_workers=1)
+    parallel = process_input(input_dir, tmp_path / "parallel", 100, max_workers=12)
+    
+    # The pool is never larger than the number of files
+    assert pool_sizes == [3]
+    assert serial['successful_files'] == parallel['successful_files'] == 2
+    assert serial['faulty_files'] == parallel['faulty_files'] == 1
+    assert serial['file_summaries'] == parallel['file_summaries']
+
 def test_process_single_file(tmp_path):
     """Test processing of a single file."""
     # Create test directories
@@ -426,36 +597,73 @@ def test_process_single_file(tmp_path):
     # Verify no error log was created (since there were no errors)
     assert not (output_dir / "errorLog.csv").exists()
 
+def test_process_input_without_timeline(tmp_path):
+    """Test that skipping the timeline table leaves the other outputs unchanged."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    create_test_file(input_dir / "valid.csv", pd.DataFrame({'Frame': [100, 150, 200, 250]}))
+    
+    full = process_input(input_dir, tmp_path / "full", 500)
+    lean = process_input(input_dir, tmp_path / "lean", 500, emit_timeline=False)
+    
+    assert not (tmp_path / "lean" / "valid_timeline.csv").exists()
+    assert (tmp_path / "lean" / "valid_events.csv").exists()
+    assert (tmp_path / "lean" / "valid_timeline.png").exists()
+    assert lean['file_summaries'] == full['file_summaries']
+
+@pytest.mark.parametrize("output_format", ["parquet", "feather"])
+def test_process_input_columnar_output(tmp_path, output_format):
+    """Test writing the timeline and event tables in a columnar format."""
+    pytest.importorskip("pyarrow")
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    output_dir = tmp_path / "output"
+    create_test_file(input_dir / "valid.csv", pd.DataFrame({'Frame': [100, 150, 200, 250]}))
+    
+    process_input(input_dir, output_dir, 500, output_format=output_format)
+    
+    read_table = pd.read_parquet if output_format == "parquet" else pd.read_feather
+    events = read_table(output_dir / f"valid_events.{output_format}")
+    timeline = read_table(output_dir / f"valid_timeline.{output_format}")
+    assert list(events['StartFrame']) == [100, 200]
+    assert len(timeline) == 500
+    assert list(timeline.columns) == ['Frame', 'GroomingFlag', 'EventID']
+    assert not (output_dir / "valid_events.csv").exists()
+
 def test_generate_timeline_plot(tmp_path):
     """Test timeline plot generation."""
-    # Create sample timeline data
-    timeline_df = pd.DataFrame({
-        'Frame': range(1, 101),
-        'GroomingFlag': [0] * 20 + [1] * 30 + [0] * 20 + [1] * 20 + [0] * 10,
-        'EventID': [0] * 20 + [1] * 30 + [0] * 20 + [2] * 20 + [0] * 10
+    # Create sample event list data
+    event_list_df = pd.DataFrame({
+        'EventID': [1, 2],
+        'StartFrame': [21, 71],
+        'StopFrame': [50, 90]
     })
     
     # Define output path
     output_path = tmp_path / "timeline_test.png"
     
     # Generate the plot
-    generate_timeline_plot(timeline_df, output_path)
+    generate_timeline_plot(event_list_df, 100, output_path)
     
     # Verify the plot file was created
     assert output_path.exists()
     assert output_path.stat().st_size > 0  # File should not be empty
 
-def test_generate_timeline_plot_empty_input():
-    """Test timeline plot generation with empty input."""
-    # Create empty DataFrame
-    empty_df = pd.DataFrame(columns=['Frame', 'GroomingFlag', 'EventID'])
+def test_generate_timeline_plot_reused_axes(tmp_path):
+    """Test that a reused figure renders exactly like a fresh one."""
+    first_df = generate_event_list(np.array([10, 50, 100, 200]))
+    second_df = generate_event_list(np.array([-10, 5, 300, 400, 1200, 1300]))
     
-    # Test with empty DataFrame
-    with pytest.raises(ValueError) as excinfo:
-        generate_timeline_plot(empty_df, Path("dummy.png"))
+    # Draw two different timelines on the same axes
+    ax = _new_axes(_TIMELINE_FIGSIZE)
+    generate_timeline_plot(first_df, 1000, tmp_path / "first.png", ax)
+    generate_timeline_plot(second_df, 1000, tmp_path / "reused.png", ax)
+    
+    # Draw the second timeline on a fresh figure
+    generate_timeline_plot(second_df, 1000, tmp_path / "fresh.png")
     
-    # Check error message
-    assert "empty" in str(excinfo.value).lower()
+    # Nothing from the first plot should leak into the second
+    assert (tmp_path / "reused.png").read_bytes() == (tmp_path / "fresh.png").read_bytes()
 
 def test_generate_box_plot(tmp_path):
     """Test box plot generation."""
@@ -476,34 +684,36 @@ def test_generate_box_plot(tmp_path):
     assert output_path.exists()
     assert output_path.stat().st_size > 0  # File should not be empty
 
-def test_generate_box_plot_empty_input():
-    """Test box plot generation with empty input."""
-    # Create empty DataFrame
+@pytest.mark.parametrize("plot", [
+    pytest.param(lambda df: generate_timeline_plot(df, 100, Path("dummy.png")), id="timeline"),
+    pytest.param(lambda df: generate_box_plot(df, Path("dummy.png")), id="box"),
+])
+def test_plots_empty_input(plot):
+    """Test that both plots reject an empty event list before drawing anything."""
     empty_df = pd.DataFrame(columns=['EventID', 'StartFrame', 'StopFrame'])
     
-    # Test with empty DataFrame
-    with pytest.raises(ValueError) as excinfo:
-        generate_box_plot(empty_df, Path("dummy.png"))
+    with pytest.raises(ValueError, match="empty"):
+        plot(empty_df)
+
+def test_plots_missing_columns():
+    """Test that plotting reports which event list columns are missing."""
+    partial_df = pd.DataFrame({'EventID': [1], 'StartFrame': [10]})
     
-    # Check error message
-    assert "empty" in str(excinfo.value).lower()
+    with pytest.raises(ValueError, match=r"missing required columns: \['StopFrame'\]"):
+        generate_box_plot(partial_df, Path("dummy.png"))
+    with pytest.raises(ValueError, match=r"missing required columns: \['StopFrame'\]"):
+        generate_timeline_plot(partial_df, 100, Path("dummy.png"))
 
-def test_visualization_integration(valid_csv, tmp_path):
+def test_visualization_integration(processed_valid, tmp_path):
     """Test integration of visualization functions with processing pipeline."""
-    # Process the CSV file
-    frames_df = process_csv(valid_csv)
-    assert frames_df is not None
-    
-    # Generate timeline and event list
     total_frames = 500
-    timeline_df = generate_timeline(frames_df['Frame'], total_frames)
-    event_list_df = generate_event_list(frames_df['Frame'])
+    _, _, event_list_df = processed_valid
     
     # Generate visualizations
     timeline_plot_path = tmp_path / "timeline_plot.png"
     box_plot_path = tmp_path / "box_plot.png"
     
-    generate_timeline_plot(timeline_df, timeline_plot_path)
+    generate_timeline_plot(event_list_df, total_frames, timeline_plot_path)
     generate_box_plot(event_list_df, box_plot_path)
     
     # Verify output files